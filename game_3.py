@@ -4,31 +4,44 @@
 # ============================================================================
 
 import sys
+import csv
 import json
 import os
 import heapq
-import math
 import sqlite3
+import atexit
 import logging
+import logging.handlers
 import traceback
-from datetime import datetime
+import functools
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime, timezone
+import numpy as np
+try:
+    import orjson  # optional: much faster save/load of the rack state
+except ImportError:
+    orjson = None
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                               QHBoxLayout, QTableWidget, QTableWidgetItem,
+                               QHBoxLayout, QTableView, QStyledItemDelegate, QStyle,
                                QPushButton, QLineEdit, QLabel, QMessageBox,
                                QComboBox, QGroupBox, QSizePolicy, QSpinBox, QDialog,
                                QScrollArea)
-from PySide6.QtCore import Qt, QTimer, QSize
-from PySide6.QtGui import QColor, QScreen
+from PySide6.QtCore import (Qt, QTimer, QSize, QElapsedTimer, QAbstractTableModel,
+                            QModelIndex, QThreadPool)
+from PySide6.QtGui import QBrush, QColor, QPainter, QScreen
 
 # ============================================================================
 # LOGGING CONFIGURATION
 # ============================================================================
+# The log file is opened on first write and records are batched in memory
+# (flushed on ERROR, when full, or at interpreter exit).
+_file_handler = logging.FileHandler('asrs_debug.log', mode='a', delay=True)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.INFO,
     format='%(asctime)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler('asrs_debug.log', mode='a')
+        logging.handlers.MemoryHandler(256, flushLevel=logging.ERROR, target=_file_handler)
     ]
 )
 logger = logging.getLogger(__name__)
@@ -43,11 +56,80 @@ logger.info("="*80)
 
 DATABASE = "asrs_system.db"
 
+# New box rows, operation log rows and maintenance cycle increments are
+# buffered while an operation runs and written in one transaction by
+# flush_ops() when it completes (also on export and exit).
+_op_buffer = []
+_box_buffer = []
+_cycle_buffer = []  # (day, cycles)
+
+# Hot-path statements; reusing the same text lets sqlite3's per-connection
+# statement cache skip re-parsing them
+_SQL_INSERT_BOX_AT = "INSERT INTO boxes (model_id, placement_date, status) VALUES (?, ?, 'stored')"
+_SQL_LOG_OP = "INSERT INTO operations_log (box_id, operation, distance_traveled) VALUES (?, ?, ?)"
+_SQL_UPDATE_MAINT = """
+    UPDATE maintenance_info
+    SET cycles_today = cycles_today + ?,
+        cycles_total = cycles_total + ?,
+        cycles_till_check = cycles_till_check - ?
+    WHERE id = 1
+"""
+_SQL_ADD_DAY_CYCLES = """
+    INSERT INTO cycles_by_day (day, cycles) VALUES (?, ?)
+    ON CONFLICT(day) DO UPDATE SET cycles = cycles + excluded.cycles
+"""
+_SQL_EXPORT_BOXES = """
+    SELECT b.box_id, m.model_name, b.placement_date, b.status
+    FROM boxes b
+    LEFT JOIN box_models m ON b.model_id = m.id
+    ORDER BY b.box_id
+"""
+
+# Box models are read-only apart from add_custom_model, which clears this cache
+_model_cache = {}
+# maintenance_info row; reset to None by the functions that change it
+_maint_cache = None
+# [day, cycles] for the most recent active days, oldest first (loaded lazily)
+CYCLE_AVG_DAYS = 30
+_daily_cycles = None
+
+# Single shared connection - reopening the file on every helper call costs far
+# more than the queries themselves.
+_conn = None
+
+def get_conn():
+    """Return the shared SQLite connection, opening it on first use"""
+    global _conn
+    if _conn is None:
+        logger.debug(f"Opening database connection: {DATABASE}")
+        _conn = sqlite3.connect(DATABASE, cached_statements=256)
+        # WAL + synchronous=NORMAL: one fsync per checkpoint instead of two
+        # per commit. The remaining settings are per-connection caches.
+        _conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-20000;
+            PRAGMA mmap_size=268435456;
+            PRAGMA secure_delete=OFF;
+        ''')
+    return _conn
+
+def close_conn():
+    """Close the shared SQLite connection (registered with atexit)"""
+    global _conn
+    if _conn is not None:
+        flush_ops()
+        _conn.close()
+        _conn = None
+
+atexit.register(close_conn)
+
 def init_database():
     """Initialize SQLite database with tables"""
     try:
         logger.info("Initializing database...")
-        conn = sqlite3.connect(DATABASE)
+        conn = get_conn()
         cursor = conn.cursor()
 
         logger.debug("Creating box_models table...")
@@ -85,6 +167,16 @@ def init_database():
             )
         ''')
 
+        logger.debug("Creating indexes...")
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_boxes_model_status
+            ON boxes (model_id, status, box_id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_ops_box
+            ON operations_log (box_id)
+        ''')
+
         logger.debug("Creating maintenance_info table...")
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS maintenance_info (
@@ -102,6 +194,28 @@ def init_database():
             VALUES (1, 1000)
         ''')
 
+        # Per-day cycle totals for the dashboard's daily average
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cycles_by_day (
+                day TEXT PRIMARY KEY,
+                cycles INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        # Databases from before this table existed: rebuild the per-day totals
+        # once from the operations log, counting cycles the way
+        # update_maintenance_cycles does (local dates, like its day keys)
+        if cursor.execute('SELECT 1 FROM cycles_by_day LIMIT 1').fetchone() is None:
+            cursor.execute('''
+                INSERT INTO cycles_by_day (day, cycles)
+                SELECT date(operation_date, 'localtime'),
+                       SUM(MAX(1, CAST(COALESCE(distance_traveled, 0) / 10 AS INTEGER)))
+                FROM operations_log
+                WHERE operation IN ('STORED', 'RETRIEVED')
+                GROUP BY 1
+            ''')
+            if cursor.rowcount > 0:
+                logger.info(f"Backfilled cycles_by_day with {cursor.rowcount} day(s) from the operations log")
+
         # -------------------------------------------------------------
         # Default models (100 entries, named as plain numbers 1, 2, 3, ...)
         # -------------------------------------------------------------
@@ -114,19 +228,13 @@ def init_database():
 
 
         logger.debug("Inserting default models...")
-        for model_name, length, width in default_models:
-            try:
-                cursor.execute('''
-                    INSERT INTO box_models (model_name, length, width)
-                    VALUES (?, ?, ?)
-                ''', (model_name, length, width))
-                logger.debug(f"Added model: {model_name}")
-            except sqlite3.IntegrityError:
-                logger.debug(f"Model already exists: {model_name}")
-                pass
+        cursor.executemany('''
+            INSERT OR IGNORE INTO box_models (model_name, length, width)
+            VALUES (?, ?, ?)
+        ''', default_models)
+        logger.debug(f"Default models inserted: {cursor.rowcount} new")
 
         conn.commit()
-        conn.close()
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
@@ -137,7 +245,7 @@ def add_custom_model(model_name, length, width):
     """Add a custom box model"""
     try:
         logger.info(f"Adding custom model: {model_name} ({length}x{width})")
-        conn = sqlite3.connect(DATABASE)
+        conn = get_conn()
         cursor = conn.cursor()
         try:
             cursor.execute('''
@@ -145,147 +253,153 @@ def add_custom_model(model_name, length, width):
                 VALUES (?, ?, ?)
             ''', (model_name, length, width))
             conn.commit()
+            _model_cache.clear()
             logger.info(f"Successfully added model: {model_name}")
             return True
         except sqlite3.IntegrityError as e:
+            conn.rollback()
             logger.warning(f"Model already exists: {model_name} - {e}")
             return False
-        finally:
-            conn.close()
     except Exception as e:
         logger.error(f"Error adding custom model: {e}")
         logger.error(traceback.format_exc())
         return False
 
-def get_all_models():
-    """Get all available box models"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    cursor.execute('SELECT id, model_name FROM box_models ORDER BY length, width')
-    models = cursor.fetchall()
-    conn.close()
-    return models
+def get_all_models(refresh=False):
+    """Get all available box models (cached until a model is added)
+
+    refresh=True re-reads the table, for callers in another process than the
+    one adding models.
+    """
+    if refresh:
+        _model_cache.clear()
+    models = _model_cache.get('all')
+    if models is None:
+        cursor = get_conn().cursor()
+        cursor.execute('SELECT id, model_name FROM box_models ORDER BY length, width')
+        models = _model_cache['all'] = cursor.fetchall()
+    return list(models)
 
 def get_model_dimensions(model_id):
-    """Get length and width of a model"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    cursor.execute('SELECT length, width FROM box_models WHERE id = ?', (model_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def log_operation(box_id, operation, distance=0):
-    """Log an operation to database"""
+    """Get length and width of a model (cached until a model is added)"""
+    dims = _model_cache.get('dims')
+    if dims is None:
+        # one query for every model instead of one per first use of each id
+        cursor = get_conn().cursor()
+        cursor.execute('SELECT id, length, width FROM box_models')
+        dims = _model_cache['dims'] = {mid: (length, width) for mid, length, width in cursor}
+    return dims.get(model_id)
+
+def flush_ops():
+    """Write all buffered box, operation log and cycle rows in a single transaction"""
+    global _maint_cache
+    if not _op_buffer and not _box_buffer and not _cycle_buffer:
+        return
     try:
-        logger.debug(f"Logging operation - Box: {box_id}, Operation: {operation}, Distance: {distance}")
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                INSERT INTO operations_log (box_id, operation, distance_traveled)
-                VALUES (?, ?, ?)
-            ''', (box_id, operation, distance))
-            conn.commit()
-            logger.debug(f"Operation logged successfully")
-        except Exception as e:
-            logger.error(f"Error logging operation: {e}")
-            logger.error(traceback.format_exc())
-        finally:
-            conn.close()
+        conn = get_conn()
+        with conn:
+            if _box_buffer:
+                conn.executemany(_SQL_INSERT_BOX_AT, _box_buffer)
+            if _op_buffer:
+                conn.executemany(_SQL_LOG_OP, _op_buffer)
+            if _cycle_buffer:
+                conn.executemany(_SQL_UPDATE_MAINT, ((c, c, c) for _, c in _cycle_buffer))
+                conn.executemany(_SQL_ADD_DAY_CYCLES, _cycle_buffer)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Flushed {len(_box_buffer)} box / {len(_op_buffer)} operation log / "
+                         f"{len(_cycle_buffer)} cycle row(s)")
+        if _cycle_buffer:
+            _maint_cache = None
+            for day, cycles in _cycle_buffer:
+                _bump_daily_cycles(day, cycles)
+        _box_buffer.clear()
+        _op_buffer.clear()
+        _cycle_buffer.clear()
     except Exception as e:
-        logger.error(f"Critical error in log_operation: {e}")
+        logger.error(f"Error flushing operation log: {e}")
         logger.error(traceback.format_exc())
 
-def update_maintenance_cycles(distance_traveled):
-    """Update maintenance cycles"""
-    try:
-        cycles = max(1, int(distance_traveled / 10))
-        logger.debug(f"Updating maintenance cycles - Distance: {distance_traveled}, Cycles: {cycles}")
+def log_operation(box_id, operation, distance=0):
+    """Queue an operation for the operations log (written by flush_ops)"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Logging operation - Box: {box_id}, Operation: {operation}, Distance: {distance}")
+    _op_buffer.append((box_id, operation, distance))
 
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
+def queue_box(model_id, log_box_id=None, distance=0):
+    """Queue a new box row (and its STORED log row) for the next flush_ops"""
+    # stamped now, in the same format as CURRENT_TIMESTAMP
+    placed = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    _box_buffer.append((model_id, placed))
+    if log_box_id is not None:
+        _op_buffer.append((log_box_id, 'STORED', distance))
 
-        try:
-            cursor.execute('''
-                UPDATE maintenance_info
-                SET cycles_today = cycles_today + ?,
-                    cycles_total = cycles_total + ?,
-                    cycles_till_check = cycles_till_check - ?
-                WHERE id = 1
-            ''', (cycles, cycles, cycles))
-            conn.commit()
-            logger.debug(f"Maintenance cycles updated successfully")
-        except Exception as e:
-            logger.error(f"Error updating cycles: {e}")
-            logger.error(traceback.format_exc())
-        finally:
-            conn.close()
-    except Exception as e:
-        logger.error(f"Critical error in update_maintenance_cycles: {e}")
-        logger.error(traceback.format_exc())
+def update_maintenance_cycles(distance_traveled):
+    """Queue the maintenance cycles for a finished operation (written by flush_ops)"""
+    cycles = max(1, int(distance_traveled / 10))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Updating maintenance cycles - Distance: {distance_traveled}, Cycles: {cycles}")
+    _cycle_buffer.append((datetime.now().date().isoformat(), cycles))
+
+def _bump_daily_cycles(day, cycles):
+    """Mirror a committed cycles_by_day increment in the in-memory window"""
+    if _daily_cycles is None:
+        return  # not loaded yet; the first read picks it up from the table
+    if _daily_cycles and _daily_cycles[-1][0] == day:
+        _daily_cycles[-1][1] += cycles
+    else:
+        _daily_cycles.append([day, cycles])
+
+def get_average_daily_cycles():
+    """Average cycles per active day over the last CYCLE_AVG_DAYS such days"""
+    global _daily_cycles
+    if _daily_cycles is None:
+        rows = get_conn().execute(
+            'SELECT day, cycles FROM cycles_by_day ORDER BY day DESC LIMIT ?',
+            (CYCLE_AVG_DAYS,)).fetchall()
+        _daily_cycles = deque(([day, cycles] for day, cycles in reversed(rows)),
+                              maxlen=CYCLE_AVG_DAYS)
+    if not _daily_cycles:
+        return 0
+    return sum(cycles for _, cycles in _daily_cycles) // len(_daily_cycles)
 
 def get_maintenance_info():
-    """Get current maintenance information"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    cursor.execute('SELECT cycles_today, cycles_total, cycles_till_check FROM maintenance_info WHERE id = 1')
-    result = cursor.fetchone()
-    conn.close()
-    return result if result else (0, 0, 1000)
-
-def add_box_to_db(model_id):
-    """Add box to database"""
-    try:
-        logger.info(f"Adding box to database - Model ID: {model_id}")
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                INSERT INTO boxes (model_id, status)
-                VALUES (?, 'stored')
-            ''', (model_id,))
-            conn.commit()
-            box_id = cursor.lastrowid
-            logger.info(f"Box added successfully - Box ID: {box_id}")
-            return box_id
-        except Exception as e:
-            logger.error(f"Error adding box to database: {e}")
-            logger.error(traceback.format_exc())
-            return None
-        finally:
-            conn.close()
-    except Exception as e:
-        logger.error(f"Critical error in add_box_to_db: {e}")
-        logger.error(traceback.format_exc())
-        return None
+    """Get current maintenance information (cached until the cycles change)"""
+    global _maint_cache
+    if _maint_cache is None:
+        cursor = get_conn().cursor()
+        cursor.execute('SELECT cycles_today, cycles_total, cycles_till_check FROM maintenance_info WHERE id = 1')
+        result = cursor.fetchone()
+        _maint_cache = result if result else (0, 0, 1000)
+    return _maint_cache
 
 def clear_all_database():
-    """Clear all database tables completely"""
+    """Clear all database tables completely (single transaction)"""
+    global _maint_cache, _daily_cycles
+    _maint_cache = None
+    _daily_cycles = None
     try:
         logger.info("Clearing all database tables...")
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
+        conn = get_conn()
         try:
-            cursor.execute('DELETE FROM boxes')
-            logger.debug("Deleted all boxes")
-            cursor.execute('DELETE FROM operations_log')
-            logger.debug("Deleted all operation logs")
-            cursor.execute('''
-                UPDATE maintenance_info
-                SET cycles_today = 0,
-                    cycles_total = 0,
-                    cycles_till_check = 1000
-                WHERE id = 1
-            ''')
-            logger.debug("Reset maintenance info")
-            conn.commit()
+            _op_buffer.clear()
+            _box_buffer.clear()
+            _cycle_buffer.clear()
+            # Bare DELETEs (no WHERE) let SQLite use its truncate optimization
+            with conn:
+                conn.execute('DELETE FROM boxes')
+                conn.execute('DELETE FROM operations_log')
+                conn.execute('DELETE FROM cycles_by_day')
+                conn.execute('''
+                    UPDATE maintenance_info
+                    SET cycles_today = 0,
+                        cycles_total = 0,
+                        cycles_till_check = 1000
+                    WHERE id = 1
+                ''')
             logger.info("Database cleared successfully")
         except Exception as e:
             logger.error(f"Database clear error: {e}")
             logger.error(traceback.format_exc())
-        finally:
-            conn.close()
     except Exception as e:
         logger.error(f"Critical error in clear_all_database: {e}")
         logger.error(traceback.format_exc())
@@ -295,10 +409,29 @@ def clear_all_database():
 # ============================================================================
 
 SAVE_FILE = "asrs_state.json"
+# writer thread for background saves (created on first use)
+_state_writer = None
 GRID_ROWS = 20
 GRID_COLS = 20
 ORIGIN_ROW = GRID_ROWS - 1
 ORIGIN_COL = 0
+# pcode number n (1-based, row-major) -> (row, col)
+PCODE_CELLS = tuple(divmod(i, GRID_COLS) for i in range(GRID_ROWS * GRID_COLS))
+# label shown in an empty cell: its 1-based linear index (= pcode number)
+LINEAR_LABELS = tuple(str(i) for i in range(1, GRID_ROWS * GRID_COLS + 1))
+PATH_CACHE_SIZE = 64
+# RackDelegate label cache is reset once it grows past this many entries
+# (box ids keep increasing and every column width adds a set of labels)
+LABEL_CACHE_SIZE = 4096
+ANIMATION_STEP_MS = 150      # one trolley step / cell paint per interval
+ANIMATION_MAX_CATCHUP = 3    # most steps replayed by one late timer tick
+ANIMATION_CELLS_PER_STEP = 1  # box cells painted per placing/picking step
+
+# Fixed status-bar messages
+STATUS_PLACING = "📦 Placing..."
+STATUS_PICKING = "🔄 Picking..."
+STATUS_RETURNING = "🔄 Returning..."
+STATUS_RESET = "✅ Rack completely reset!"
 
 # Colors
 EMPTY_COLOR = QColor(240, 240, 240)
@@ -308,6 +441,15 @@ PLACING_COLOR = QColor(255, 215, 0)
 PATH_COLOR = QColor(173, 216, 230)
 RETRIEVING_COLOR = QColor(255, 165, 0)
 
+# Brushes shared by every cell repaint (built once, not per setBackground call)
+EMPTY_BRUSH = QBrush(EMPTY_COLOR)
+OCCUPIED_BRUSH = QBrush(OCCUPIED_COLOR)
+TROLLEY_BRUSH = QBrush(TROLLEY_COLOR)
+PLACING_BRUSH = QBrush(PLACING_COLOR)
+PATH_BRUSH = QBrush(PATH_COLOR)
+RETRIEVING_BRUSH = QBrush(RETRIEVING_COLOR)
+WHITE_FG = QBrush(Qt.white)
+
 # ============================================================================
 # SECTION 3: DATA STRUCTURES
 # ============================================================================
@@ -320,6 +462,11 @@ class Box:
         self.box_id = box_id
         self.model_id = model_id
     
+    def cells(self, start_row, start_col):
+        """Row-major (row, col) cells covered when placed at (start_row, start_col)"""
+        cols = range(start_col, start_col + self.length)
+        return [(r, c) for r in range(start_row, start_row + self.width) for c in cols]
+
     def to_dict(self):
         return {'length': self.length, 'width': self.width, 'box_id': self.box_id, 'model_id': self.model_id}
     
@@ -329,14 +476,32 @@ class Box:
 
 class Rack:
     """Represents the ASRS rack system"""
+    # The trolley travels above the stored boxes, so occupied cells do not
+    # block its path (see a_star_pathfinding).
+    has_obstacles = False
+
     def __init__(self, rows, cols):
         self.rows = rows
         self.cols = cols
-        self.grid = [[None for _ in range(cols)] for _ in range(rows)]
+        # box_id per cell, 0 = empty
+        self.grid = np.zeros((rows, cols), dtype=np.int32)
+        # per-row occupancy bitmask (bit c set = column c occupied), kept in
+        # step with grid for cheap collision tests
+        self.row_mask = [0] * rows
         self.boxes = {}
         self.box_positions = {}
         self.next_box_id = 1
-        self.box_order = []
+        # insertion-ordered box ids (values unused): O(1) append, removal and
+        # first/last peek for FIFO/LIFO
+        self.box_order = OrderedDict()
+        # same ordering per model_id, for model-filtered LIFO/FIFO
+        self.by_model = defaultdict(OrderedDict)
+        # number of occupied cells, maintained by place_box/remove_box
+        self._occupied = 0
+        # bumped on every place/remove so views can tell the rack changed
+        self.version = 0
+        # bytes of the last state written by save_game_state
+        self._last_saved = None
     
     def can_place_box(self, box, start_row, start_col):
         end_row = start_row + box.width
@@ -345,11 +510,11 @@ class Rack:
         if end_row > self.rows or end_col > self.cols:
             return False
         
+        mask = ((1 << box.length) - 1) << start_col
+        row_mask = self.row_mask
         for r in range(start_row, end_row):
-            for c in range(start_col, end_col):
-                if self.grid[r][c] is not None:
-                    return False
-        
+            if row_mask[r] & mask:
+                return False
         return True
     
     def place_box(self, box, start_row, start_col):
@@ -362,13 +527,17 @@ class Rack:
         end_row = start_row + box.width
         end_col = start_col + box.length
         
+        self.grid[start_row:end_row, start_col:end_col] = box.box_id
+        mask = ((1 << box.length) - 1) << start_col
         for r in range(start_row, end_row):
-            for c in range(start_col, end_col):
-                self.grid[r][c] = box.box_id
+            self.row_mask[r] |= mask
         
         self.boxes[box.box_id] = box
         self.box_positions[box.box_id] = (start_row, start_col)
-        self.box_order.append(box.box_id)
+        self.box_order[box.box_id] = None
+        self.by_model[box.model_id][box.box_id] = None
+        self._occupied += box.width * box.length
+        self.version += 1
         
         return True
     
@@ -382,141 +551,240 @@ class Rack:
         end_row = start_row + box.width
         end_col = start_col + box.length
         
+        self.grid[start_row:end_row, start_col:end_col] = 0
+        mask = ~(((1 << box.length) - 1) << start_col)
         for r in range(start_row, end_row):
-            for c in range(start_col, end_col):
-                self.grid[r][c] = None
+            self.row_mask[r] &= mask
         
         del self.boxes[box_id]
         del self.box_positions[box_id]
-        self.box_order.remove(box_id)
+        del self.box_order[box_id]
+        model_boxes = self.by_model[box.model_id]
+        del model_boxes[box_id]
+        if not model_boxes:
+            del self.by_model[box.model_id]
+        self._occupied -= box.width * box.length
+        self.version += 1
         
         return True
     
     def get_lifo_box(self):
-        if not self.box_order:
-            return None
-        return self.box_order[-1]
+        return next(reversed(self.box_order), None)
     
     def get_fifo_box(self):
-        if not self.box_order:
-            return None
-        return self.box_order[0]
+        return next(iter(self.box_order), None)
     
     def get_lifo_box_by_model(self, model_id):
         """Get LIFO box from specific model"""
-        for box_id in reversed(self.box_order):
-            if self.boxes[box_id].model_id == model_id:
-                return box_id
-        return None
+        return next(reversed(self.by_model.get(model_id, ())), None)
     
     def get_fifo_box_by_model(self, model_id):
         """Get FIFO box from specific model"""
-        for box_id in self.box_order:
-            if self.boxes[box_id].model_id == model_id:
-                return box_id
-        return None
+        return next(iter(self.by_model.get(model_id, ())), None)
     
     def get_boxes_by_model(self, model_id):
         """Get all boxes of a specific model"""
-        return [box_id for box_id in self.box_order if self.boxes[box_id].model_id == model_id]
+        return list(self.by_model.get(model_id, ()))
     
     def find_closest_available_location(self, box, origin_row, origin_col):
-        closest_location = None
-        min_distance = float('inf')
-        
-        for row in range(self.rows - box.width + 1):
-            for col in range(self.cols - box.length + 1):
-                if self.can_place_box(box, row, col):
-                    distance = math.sqrt((row - origin_row)**2 + (col - origin_col)**2)
-                    
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest_location = (row, col)
-        
-        return closest_location
+        """Closest free top-left position for box (Euclidean distance to origin)"""
+        w, l = box.width, box.length
+        if w > self.rows or l > self.cols:
+            return None
+
+        # Summed-area table (zero-padded) gives every w x l window sum in O(1)
+        sat = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+        sat[1:, 1:] = (self.grid != 0).cumsum(axis=0).cumsum(axis=1)
+        free = (sat[w:, l:] - sat[:-w, l:] - sat[w:, :-l] + sat[:-w, :-l]) == 0
+        if not free.any():
+            return None
+
+        # Squared distance keeps the comparison exact; argmin returns the first
+        # minimum in row-major order, same tie-break as the old nested loops
+        rr, cc = np.indices(free.shape)
+        dist2 = (rr - origin_row) ** 2 + (cc - origin_col) ** 2
+        idx = np.where(free, dist2, np.iinfo(dist2.dtype).max).argmin()
+        row, col = np.unravel_index(idx, free.shape)
+        return (int(row), int(col))
     
     def get_occupied_cells(self):
-        return sum(1 for row in self.grid for cell in row if cell is not None)
+        return self._occupied
     
     def to_dict(self):
         return {
             'rows': self.rows,
             'cols': self.cols,
-            'grid': self.grid,
+            # saved as nested lists with None for empty cells (original format)
+            'grid': [[cell or None for cell in row] for row in self.grid.tolist()],
             'boxes': {box_id: box.to_dict() for box_id, box in self.boxes.items()},
             'box_positions': self.box_positions,
             'next_box_id': self.next_box_id,
-            'box_order': self.box_order
+            'box_order': list(self.box_order)
         }
     
     @staticmethod
     def from_dict(data):
         rack = Rack(data['rows'], data['cols'])
-        rack.grid = data['grid']
+        rack.grid = np.array([[cell or 0 for cell in row] for row in data['grid']],
+                             dtype=np.int32)
+        rack._occupied = int(np.count_nonzero(rack.grid))
+        rack.row_mask = [sum(1 << c for c, cell in enumerate(row) if cell)
+                         for row in rack.grid.tolist()]
         rack.boxes = {int(box_id): Box.from_dict(box_data) 
                      for box_id, box_data in data['boxes'].items()}
         rack.box_positions = {int(k): tuple(v) for k, v in data['box_positions'].items()}
         rack.next_box_id = data['next_box_id']
-        rack.box_order = data.get('box_order', [])
+        rack.box_order = OrderedDict.fromkeys(data.get('box_order', []))
+        for box_id in rack.box_order:
+            rack.by_model[rack.boxes[box_id].model_id][box_id] = None
         return rack
 
 # ============================================================================
 # SECTION 4: PATHFINDING & SAVE/LOAD
 # ============================================================================
 
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def a_star_pathfinding(grid, start, goal):
-    rows = len(grid)
-    cols = len(grid[0])
+def manhattan_path(start, goal):
+    """Shortest 4-connected path on an obstacle-free grid (start excluded).
+
+    Moves along the row axis first, then along the column axis.
+    """
+    row, col = start
+    goal_row, goal_col = goal
+    row_step = 1 if goal_row > row else -1
+    col_step = 1 if goal_col > col else -1
+    path = [(r, col) for r in range(row + row_step, goal_row + row_step, row_step)]
+    path.extend((goal_row, c) for c in range(col + col_step, goal_col + col_step, col_step))
+    return path
+
+# 4-connected neighbour offsets (row, col), in expansion order
+_OFFS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+@functools.lru_cache(maxsize=None)
+def _nb_astar():
+    """Numba A* kernel from pathing_nb, or None without numba.
+
+    Imported on the first obstacle-aware search only: numba is slow to
+    import and obstacle-free racks never need it.
+    """
+    try:
+        from pathing_nb import astar
+    except ImportError:
+        return None
+    return astar
+
+def a_star_pathfinding(grid, start, goal, avoid_occupied=False):
+    """Path from start to goal (start excluded).
+
+    Unless avoid_occupied is set every cell is passable, so the closed-form
+    Manhattan staircase is already optimal and no search is needed.
+    """
+    if not avoid_occupied:
+        return manhattan_path(start, goal)
+
+    if start == goal:
+        return []
+    # The goal can only be entered from a free neighbour (or from start);
+    # if it is walled in, skip a search that would flood the whole grid
+    goal_row, goal_col = goal
+    rows, cols = grid.shape
+    for d_row, d_col in _OFFS:
+        n_row = goal_row + d_row
+        n_col = goal_col + d_col
+        if 0 <= n_row < rows and 0 <= n_col < cols and (
+                not grid[n_row, n_col] or (n_row, n_col) == start):
+            break
+    else:
+        return []
+
+    nb_astar = _nb_astar()
+    if nb_astar is not None:
+        return [tuple(step) for step in
+                nb_astar(grid, start[0], start[1], goal[0], goal[1]).tolist()]
+
+    occupied = grid.ravel().tolist()
     
-    open_list = []
-    heapq.heappush(open_list, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+    # Cells are encoded as row * cols + col; scores live in flat lists
+    # instead of tuple-keyed dicts
+    size = rows * cols
+    start_idx = start[0] * cols + start[1]
+    goal_idx = goal_row * cols + goal_col
+    g_score = [size] * size  # size is longer than any real path
+    came_from = [-1] * size
+    g_score[start_idx] = 0
+    
+    heappush, heappop = heapq.heappush, heapq.heappop
+    # entries are (f, -g, idx): among equal f the deepest node is expanded
+    # first, so on open stretches the search runs straight at the goal
+    # instead of fanning out over the whole equal-f region
+    open_list = [(0, 0, start_idx)]
     
     while open_list:
-        current = heapq.heappop(open_list)[1]
+        current = heappop(open_list)[2]
         
-        if current == goal:
-            path = [current]
-            while current in came_from:
+        if current == goal_idx:
+            # walk back to (but excluding) the starting cell
+            path = []
+            while current != start_idx:
+                path.append(divmod(current, cols))
                 current = came_from[current]
-                path.append(current)
             path.reverse()
-            # return everything except the starting cell
-            return path[1:]
+            return path
         
-        neighbors = [
-            (current[0]-1, current[1]),
-            (current[0]+1, current[1]),
-            (current[0], current[1]-1),
-            (current[0], current[1]+1)
-        ]
+        row, col = divmod(current, cols)
+        tentative_g = g_score[current] + 1
         
-        for neighbor in neighbors:
-            row, col = neighbor
-            
-            if not (0 <= row < rows and 0 <= col < cols):
+        for d_row, d_col in _OFFS:
+            n_row = row + d_row
+            n_col = col + d_col
+            if not (0 <= n_row < rows and 0 <= n_col < cols):
+                continue
+            neighbor = n_row * cols + n_col
+            if occupied[neighbor] and neighbor != goal_idx:
                 continue
             
-            tentative_g = g_score[current] + 1
-            
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+            if tentative_g < g_score[neighbor]:
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + heuristic(neighbor, goal)
-                heapq.heappush(open_list, (f_score[neighbor], neighbor))
+                # Manhattan distance to the goal as the heuristic
+                f_score = tentative_g + abs(n_row - goal_row) + abs(n_col - goal_col)
+                heappush(open_list, (f_score, -tentative_g, neighbor))
     
     return []
 
-def save_game_state(rack):
+def _dump_state(state):
+    """Serialize a rack dict to JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(state, sort_keys=True).encode('utf-8')
+
+def _load_state(raw):
+    """Parse JSON bytes written by _dump_state (or an older save file)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _save_pool():
+    """Single-thread pool for save-file writes, so queued saves land in order"""
+    global _state_writer
+    if _state_writer is None:
+        _state_writer = QThreadPool()
+        _state_writer.setMaxThreadCount(1)
+    return _state_writer
+
+def wait_for_saves():
+    """Block until background save_game_state writes have finished"""
+    if _state_writer is not None:
+        _state_writer.waitForDone()
+
+def _write_state(rack, data):
     try:
-        logger.debug("Saving game state...")
-        with open(SAVE_FILE, 'w') as f:
-            json.dump(rack.to_dict(), f, indent=2)
+        # Write to a temp file and swap it in so a crash never leaves a
+        # half-written save file behind
+        tmp_file = SAVE_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, SAVE_FILE)
+        rack._last_saved = data
         logger.info("Game state saved successfully")
         return True
     except Exception as e:
@@ -524,6 +792,31 @@ def save_game_state(rack):
         logger.error(traceback.format_exc())
         return False
 
+def save_game_state(rack, background=False):
+    """Save the rack to SAVE_FILE
+
+    The rack is serialized on the calling thread; with background=True the
+    file write runs on a worker thread and True means "queued".
+    """
+    flush_ops()
+    try:
+        data = _dump_state(rack.to_dict())
+        # compare the bytes themselves; a hash match alone could skip a real change
+        if data == rack._last_saved and os.path.exists(SAVE_FILE):
+            logger.debug("Game state unchanged, skipping save")
+            return True
+
+        logger.debug("Saving game state...")
+        if background:
+            _save_pool().start(lambda: _write_state(rack, data))
+            return True
+        wait_for_saves()
+        return _write_state(rack, data)
+    except Exception as e:
+        logger.error(f"Error saving game state: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
 def load_game_state():
     try:
         if not os.path.exists(SAVE_FILE):
@@ -531,8 +824,8 @@ def load_game_state():
             return None
 
         logger.info("Loading game state from file...")
-        with open(SAVE_FILE, 'r') as f:
-            data = json.load(f)
+        with open(SAVE_FILE, 'rb') as f:
+            data = _load_state(f.read())
         rack = Rack.from_dict(data)
         logger.info(f"Game state loaded - {len(rack.boxes)} boxes in rack")
         return rack
@@ -545,6 +838,127 @@ def load_game_state():
 # SECTION 5: MAIN WINDOW CLASS (ASRSWindow)
 # ============================================================================
 
+class RackModel(QAbstractTableModel):
+    """Table model over the rack grid, trolley position and path overlay.
+
+    Cells are computed on demand, so there is no per-cell item storage;
+    sync() signals only the cells whose content changed.
+    """
+
+    def __init__(self, rack, parent=None):
+        super().__init__(parent)
+        self.rack = rack
+        self.trolley = None
+        self.path = frozenset()
+        # snapshot of rack.grid as nested lists, refreshed when the rack changes
+        self._grid = rack.grid.tolist()
+        self._version = -1
+        # cells painted by the placing/picking animation until the next sync
+        self._overlay = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else GRID_ROWS
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else GRID_COLS
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return str(section)
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return self.cell(index.row(), index.column())[1]
+        if role == Qt.BackgroundRole:
+            return self.cell(index.row(), index.column())[0]
+        if role == Qt.ForegroundRole:
+            return self.cell(index.row(), index.column())[2]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def cell(self, row, col):
+        """(background brush, text, foreground brush or None) for one cell"""
+        pos = (row, col)
+        if self._overlay and pos in self._overlay:
+            return self._overlay[pos]
+        if pos == self.trolley:
+            return TROLLEY_BRUSH, "🚛", WHITE_FG
+        if pos in self.path:
+            return PATH_BRUSH, "•", None
+        box_id = self._grid[row][col]
+        if box_id == 0:
+            return EMPTY_BRUSH, LINEAR_LABELS[row * GRID_COLS + col], None
+        return OCCUPIED_BRUSH, str(box_id), WHITE_FG
+
+    def sync(self, rack, trolley, path):
+        """Adopt the current rack/trolley/path and signal the changed cells"""
+        if rack is not self.rack or rack.version != self._version:
+            self.rack = rack
+            self._version = rack.version
+            self._grid = rack.grid.tolist()
+            self.trolley = trolley
+            self.path = path
+            self._overlay.clear()
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(GRID_ROWS - 1, GRID_COLS - 1), [])
+            return
+
+        # the window hands over one frozenset per path, so an unchanged
+        # path is the same object and needs no set comparison
+        dirty = set() if path is self.path else set(self.path ^ path)
+        dirty.update(self._overlay)
+        self._overlay.clear()
+        dirty.add(self.trolley)
+        dirty.add(trolley)
+        self.trolley = trolley
+        self.path = path
+        for row, col in dirty:
+            index = self.index(row, col)
+            self.dataChanged.emit(index, index, [])
+
+    def set_overlay(self, row, col, brush, text):
+        """Temporarily show brush/text in one cell (cleared by the next sync)"""
+        self._overlay[(row, col)] = (brush, text, None)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [])
+
+
+class RackDelegate(QStyledItemDelegate):
+    """Paints rack cells straight from RackModel.cell"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._model = model
+        # (text, width) -> (text elided to fit like the default delegate,
+        #                   plain number label?)
+        self._labels = {}
+
+    def paint(self, painter, option, index):
+        brush, text, fg = self._model.cell(index.row(), index.column())
+        rect = option.rect
+        key = (text, rect.width())
+        label = self._labels.get(key)
+        if label is None:
+            margin = option.widget.style().pixelMetric(QStyle.PM_FocusFrameHMargin) + 1
+            label = (option.fontMetrics.elidedText(text, Qt.ElideRight, key[1] - 2 * margin),
+                     text.isdigit())
+            if len(self._labels) >= LABEL_CACHE_SIZE:
+                self._labels.clear()
+            self._labels[key] = label
+        palette = option.palette
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, palette.highlight())
+            painter.setPen(palette.highlightedText().color())
+        else:
+            painter.fillRect(rect, brush)
+            painter.setPen((fg or palette.text()).color())
+        # cells are axis-aligned fills; plain number labels don't need smoothing
+        painter.setRenderHint(QPainter.TextAntialiasing, not label[1])
+        painter.drawText(rect, Qt.AlignCenter, label[0])
+
+
 class ASRSWindow(QMainWindow):
     def __init__(self):
         try:
@@ -566,6 +980,9 @@ class ASRSWindow(QMainWindow):
             cell_width = min(35, max(20, (available_width - 100) // GRID_COLS))
             cell_height = min(35, max(20, (available_height - 400) // GRID_ROWS))
             self.cell_size = min(cell_width, cell_height)
+            # only when the minimum cell size overflows does the grid need a scroll area
+            self.grid_fits_screen = (GRID_COLS * self.cell_size <= available_width - 100 and
+                                     GRID_ROWS * self.cell_size <= available_height - 400)
 
             logger.info(f"Calculated cell size: {self.cell_size}px")
 
@@ -590,16 +1007,34 @@ class ASRSWindow(QMainWindow):
             self.trolley_row = ORIGIN_ROW
             self.trolley_col = ORIGIN_COL
             self.trolley_path = []
+            self._path_idx = 0
             self.is_animating = False
             self.operation_mode = 'idle'
+            # animate() step per operation_mode ('idle' has none)
+            self._mode_handlers = {
+                'storing_moving': self._animate_storing_moving,
+                'storing_placing': self._animate_storing_placing,
+                'retrieving_moving': self._animate_retrieving_moving,
+                'retrieving_picking': self._animate_retrieving_picking,
+                'returning': self._animate_returning,
+                'goto_pcode': self._animate_goto_pcode,
+            }
             self.animation_cell_index = 0
             self.animation_cells = []
             self.pending_box = None
             self.pending_position = None
-            self.path_visualization = []
+            # cells of the current path, built once per path (shared with RackModel)
+            self.path_visualization = frozenset()
             self.retrieving_box_id = None
             self.distance_traveled = 0
             self.pending_model_id = None
+            # recent trolley paths keyed by (start, goal, rack version)
+            self._path_cache = OrderedDict()
+            # view refreshes skipped while hidden, replayed on the next show
+            self._refresh_pending = False
+            self._last_stats = None
+            self._last_status = None
+            self._last_dashboard = None
 
             logger.debug("Setting up UI...")
             self.setup_ui()
@@ -608,7 +1043,11 @@ class ASRSWindow(QMainWindow):
             self.update_dashboard()
 
             self.animation_timer = QTimer()
-            self.animation_timer.timeout.connect(self.animate)
+            self.animation_timer.setTimerType(Qt.PreciseTimer)
+            self.animation_timer.timeout.connect(self._animation_tick)
+            # wall-clock pacing: steps due = elapsed // ANIMATION_STEP_MS
+            self._anim_clock = QElapsedTimer()
+            self._anim_steps = 0
 
             logger.info("ASRS Window initialized successfully")
         except Exception as e:
@@ -701,8 +1140,10 @@ class ASRSWindow(QMainWindow):
         retrieval_group.setLayout(retrieval_layout)
         main_layout.addWidget(retrieval_group)
         
-        self.load_models_to_combo(self.model_combo)
-        self.load_models_to_combo(self.filter_model_combo)
+        # Deferred, not threaded: filled on the UI thread once __init__ has
+        # returned (one cached DB read shared by both combos). Combo widgets
+        # can only be touched from the UI thread anyway.
+        QTimer.singleShot(0, self._populate_combos)
         
         # ===== DASHBOARD SECTION =====
         dashboard_group = QGroupBox("📊 Maintenance Dashboard")
@@ -769,35 +1210,33 @@ class ASRSWindow(QMainWindow):
         main_layout.addWidget(dashboard_group)
         
         # ===== GRID SECTION =====
-        self.table = QTableWidget(GRID_ROWS, GRID_COLS)
-
-        # Set responsive cell sizes
+        self.rack_model = RackModel(self.rack, self)
+        self.table = QTableView()
+        self.table.setModel(self.rack_model)
+        self.table.setItemDelegate(RackDelegate(self.rack_model, self.table))
+
+        # Set responsive cell sizes; lower the headers' minimum section size
+        # first, or its default (~26px) widens cells on smaller screens
+        h_header = self.table.horizontalHeader()
+        v_header = self.table.verticalHeader()
+        h_header.setMinimumSectionSize(self.cell_size)
+        v_header.setMinimumSectionSize(self.cell_size)
         for i in range(GRID_ROWS):
             self.table.setRowHeight(i, self.cell_size)
         for i in range(GRID_COLS):
             self.table.setColumnWidth(i, self.cell_size)
 
-        # Calculate table size based on cell size
-        table_width = GRID_COLS * self.cell_size + 50
-        table_height = GRID_ROWS * self.cell_size + 50
-        self.table.setMinimumSize(table_width, table_height)
-        self.table.setMaximumSize(table_width, table_height)
-
-        # Make table size policy expanding but respect min/max
-        self.table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.table.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.table.setCornerButtonEnabled(False)
         
-        self.table.horizontalHeader().setVisible(True)
-        self.table.verticalHeader().setVisible(True)
+        h_header.setVisible(True)
+        v_header.setVisible(True)
         
-        for col in range(GRID_COLS):
-            self.table.setHorizontalHeaderItem(col, QTableWidgetItem(str(col)))
-        for row in range(GRID_ROWS):
-            self.table.setVerticalHeaderItem(row, QTableWidgetItem(str(row)))
-
         # Responsive header font size based on cell size
         header_font_size = max(8, min(12, self.cell_size // 2))
 
-        self.table.horizontalHeader().setStyleSheet(f"""
+        h_header.setStyleSheet(f"""
             QHeaderView::section {{
                 background-color: #4CAF50;
                 color: white;
@@ -808,7 +1247,7 @@ class ASRSWindow(QMainWindow):
             }}
         """)
 
-        self.table.verticalHeader().setStyleSheet(f"""
+        v_header.setStyleSheet(f"""
             QHeaderView::section {{
                 background-color: #2196F3;
                 color: white;
@@ -819,21 +1258,34 @@ class ASRSWindow(QMainWindow):
             }}
         """)
         
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-
-        # Wrap table in scroll area for smaller screens
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(self.table)
-        scroll_area.setWidgetResizable(False)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setAlignment(Qt.AlignCenter)
-
-        # Set scroll area size policy
-        scroll_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+
+        # Fixed table size: all cells plus the (styled) headers and the frame
+        self.table.ensurePolished()
+        frame = 2 * self.table.frameWidth()
+        table_width = h_header.length() + v_header.sizeHint().width() + frame
+        table_height = v_header.length() + h_header.sizeHint().height() + frame
+        self.table.setFixedSize(table_width, table_height)
+        # headers, corner button and viewport cover the whole frame, so the
+        # parent need not paint a background underneath it
+        self.table.setAttribute(Qt.WA_OpaquePaintEvent, True)
 
         table_container = QHBoxLayout()
-        table_container.addWidget(scroll_area)
+        if self.grid_fits_screen:
+            # fixed-size table placed directly: no scroll area re-layout on resize
+            table_container.addWidget(self.table, 0, Qt.AlignCenter)
+        else:
+            # Wrap table in scroll area for smaller screens
+            scroll_area = QScrollArea()
+            scroll_area.setWidget(self.table)
+            scroll_area.setWidgetResizable(False)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setAlignment(Qt.AlignCenter)
+
+            # Set scroll area size policy
+            scroll_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            table_container.addWidget(scroll_area)
         main_layout.addLayout(table_container)
         
         # ===== STATUS & STATS =====
@@ -870,16 +1322,19 @@ class ASRSWindow(QMainWindow):
         if mode != "BY ID":
             self.retrieve_id_input.clear()
     
-    def load_models_to_combo(self, combo):
-        """Load models to dropdown"""
-        combo.clear()
-        models = get_all_models()
+    def _populate_combos(self, models=None):
+        """Load models into both dropdowns (signals blocked while filling)"""
+        if models is None:
+            models = get_all_models()
         
-        if combo == self.filter_model_combo:
-            combo.addItem("All Models", None)
-        
-        for model_id, model_name in models:
-            combo.addItem(model_name, model_id)
+        for combo in (self.model_combo, self.filter_model_combo):
+            combo.blockSignals(True)
+            combo.clear()
+            if combo is self.filter_model_combo:
+                combo.addItem("All Models", None)
+            for model_id, model_name in models:
+                combo.addItem(model_name, model_id)
+            combo.blockSignals(False)
     
     def add_custom_model_dialog(self):
         """Add custom model dialog"""
@@ -920,8 +1375,7 @@ class ASRSWindow(QMainWindow):
                 return
             
             if add_custom_model(model_name, length_input.value(), width_input.value()):
-                self.load_models_to_combo(self.model_combo)
-                self.load_models_to_combo(self.filter_model_combo)
+                self._populate_combos()
                 QMessageBox.information(dialog, "Success", f"Model {model_name} added!")
                 dialog.accept()
             else:
@@ -973,7 +1427,7 @@ class ASRSWindow(QMainWindow):
             logger.info(f"Target location found: {target}")
             logger.debug(f"Calculating path from ({self.trolley_row}, {self.trolley_col}) to {target}")
 
-            path = a_star_pathfinding(self.rack.grid, (self.trolley_row, self.trolley_col), target)
+            path = self._astar((self.trolley_row, self.trolley_col), target)
             distance = len(path)
 
             logger.info(f"Path calculated - Distance: {distance} steps")
@@ -988,48 +1442,46 @@ class ASRSWindow(QMainWindow):
     
     def update_dashboard(self):
         """Update dashboard"""
-        cycles_today, cycles_total, cycles_till_check = get_maintenance_info()
+        if self._view_hidden():
+            return
+        info = get_maintenance_info()
+        if info == self._last_dashboard:
+            return
+        self._last_dashboard = info
+        cycles_today, cycles_total, cycles_till_check = info
         
         self.cycles_today_label.setText(str(cycles_today))
         self.cycles_total_label.setText(str(cycles_total))
         self.cycles_check_label.setText(str(max(0, cycles_till_check)))
         
         if cycles_total > 0:
-            avg = cycles_total // max(1, 1)
-            self.avg_cycles_label.setText(str(avg))
+            self.avg_cycles_label.setText(str(get_average_daily_cycles()))
     
     def export_report(self):
         """Export report"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"asrs_report_{timestamp}.csv"
+            flush_ops()
             
-            conn = sqlite3.connect(DATABASE)
-            cursor = conn.cursor()
-            
-            report = "Box ID,Model,Placement Date,Status\n"
-            
-            cursor.execute('''
-                SELECT b.box_id, m.model_name, b.placement_date, b.status
-                FROM boxes b
-                LEFT JOIN box_models m ON b.model_id = m.id
-                ORDER BY b.box_id
-            ''')
+            cursor = get_conn().execute(_SQL_EXPORT_BOXES)
             
-            rows = cursor.fetchall()
+            rows = cursor.fetchmany(1000)
             
             if not rows:
                 QMessageBox.information(self, "Info", "No boxes in database yet!")
                 return
             
-            for row in rows:
-                report += f"{row[0]},{row[1] if row[1] else 'Unknown'},{row[2]},{row[3]}\n"
-            
-            with open(filename, 'w') as f:
-                f.write(report)
+            # Stream rows to the file in batches instead of building one string
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(["Box ID", "Model", "Placement Date", "Status"])
+                while rows:
+                    writer.writerows((row[0], row[1] or 'Unknown', row[2], row[3])
+                                     for row in rows)
+                    rows = cursor.fetchmany(1000)
             
             QMessageBox.information(self, "Exported", f"Report saved as:\n{filename}")
-            conn.close()
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Error:\n{str(e)}")
     
@@ -1042,53 +1494,118 @@ class ASRSWindow(QMainWindow):
             self.pending_box = box
             self.pending_position = position
             self.trolley_path = path
-            self.path_visualization = set(path)
+            self._path_idx = 0
+            self.path_visualization = frozenset(path)
             self.animation_cell_index = 0
             self.distance_traveled = distance
 
-            self.status_label.setText(f"📦 STORAGE: Moving to ({position[0]},{position[1]}) | Distance: {distance}")
+            self._set_status(f"📦 STORAGE: Moving to ({position[0]},{position[1]}) | Distance: {distance}")
             self.add_button.setEnabled(False)
             self.retrieve_button.setEnabled(False)
             self.update_grid_display()
-            self.animation_timer.start(150)
+            self._start_animation()
             logger.debug("Storage animation started")
         except Exception as e:
             logger.error(f"Error starting storage animation: {e}")
             logger.error(traceback.format_exc())
     
     def update_grid_display(self):
-        """Update grid - now shows pcode labels for empty cells"""
-        for row in range(GRID_ROWS):
-            for col in range(GRID_COLS):
-                item = QTableWidgetItem()
-                item.setTextAlignment(Qt.AlignCenter)
-                
-                if self.trolley_row == row and self.trolley_col == col:
-                    item.setBackground(TROLLEY_COLOR)
-                    item.setText("🚛")
-                    item.setForeground(Qt.white)
-                elif (row, col) in self.path_visualization:
-                    item.setBackground(PATH_COLOR)
-                    item.setText("•")
-                elif self.rack.grid[row][col] is None:
-                    # Compute linear index and display number label for empty slots
-                    linear_idx = row * GRID_COLS + col + 1
-                    item.setBackground(EMPTY_COLOR)
-                    item.setText(str(linear_idx))
-                else:
-                    box_id = self.rack.grid[row][col]
-                    item.setBackground(OCCUPIED_COLOR)
-                    item.setText(str(box_id))
-                    item.setForeground(Qt.white)
-                
-                self.table.setItem(row, col, item)
-    
+        """Update grid - now shows pcode labels for empty cells
+
+        RackModel repaints only the trolley cells, path changes and
+        animation-painted cells, unless the rack itself changed.
+        """
+        if self._view_hidden():
+            return
+        self.rack_model.sync(self.rack, (self.trolley_row, self.trolley_col),
+                             self.path_visualization)
+
+    def _set_status(self, text):
+        """Set the status bar text, skipping the Qt call if it is unchanged"""
+        if text != self._last_status:
+            self._last_status = text
+            self.status_label.setText(text)
+
+    def _astar(self, start, goal):
+        """a_star_pathfinding on the current rack, memoized.
+
+        Returns the cached tuple itself, not a copy: it is immutable, so
+        every caller for the same endpoints shares it. Callers walk it by
+        index (see _step_trolley) and never modify it.
+        """
+        rack = self.rack
+        # obstacle-free paths do not depend on the rack contents
+        key = (start, goal, rack.version if rack.has_obstacles else None)
+        path = self._path_cache.get(key)
+        if path is None:
+            path = tuple(a_star_pathfinding(rack.grid, start, goal, rack.has_obstacles))
+            self._path_cache[key] = path
+            if len(self._path_cache) > PATH_CACHE_SIZE:
+                self._path_cache.popitem(last=False)
+        else:
+            self._path_cache.move_to_end(key)
+        return path
+
+    def _view_hidden(self):
+        """True while the window is hidden or minimized (refresh deferred to showEvent)"""
+        if self.isVisible() and not self.isMinimized():
+            return False
+        self._refresh_pending = True
+        return True
+
+    def _refresh_view(self):
+        """Replay refreshes that were skipped while the window was hidden"""
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.update_grid_display()
+            self.update_stats()
+            self.update_dashboard()
+
+    def _start_animation(self):
+        """(Re)start the animation timer with a fresh step clock"""
+        self._anim_clock.start()
+        self._anim_steps = 0
+        self.animation_timer.start(ANIMATION_STEP_MS)
+
+    def _animation_tick(self):
+        """Run every animation step that is due; catches up after a late tick"""
+        # rounded, so a tick that fires a millisecond early still counts
+        due = min((self._anim_clock.elapsed() + ANIMATION_STEP_MS // 2) // ANIMATION_STEP_MS,
+                  self._anim_steps + ANIMATION_MAX_CATCHUP)
+        while self._anim_steps < due and self.animation_timer.isActive():
+            self._anim_steps += 1
+            self.animate()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # deferred so the window state (e.g. un-minimized) has settled
+        QTimer.singleShot(0, self._refresh_view)
+        if self.is_animating and not self.animation_timer.isActive():
+            self._start_animation()
+
+    def closeEvent(self, event):
+        # persist buffered op-log rows and release the shared connection
+        # (get_conn reopens it if the window is shown again)
+        wait_for_saves()
+        close_conn()
+        super().closeEvent(event)
+
+    def hideEvent(self, event):
+        # pause the trolley animation while nothing can see it
+        self.animation_timer.stop()
+        super().hideEvent(event)
+
     def update_stats(self):
         """Update stats"""
+        if self._view_hidden():
+            return
         total_cells = GRID_ROWS * GRID_COLS
         occupied = self.rack.get_occupied_cells()
-        empty = total_cells - occupied
         num_boxes = len(self.rack.boxes)
+        if (num_boxes, occupied) == self._last_stats:
+            return
+        self._last_stats = (num_boxes, occupied)
+        empty = total_cells - occupied
         capacity = (occupied * 100) // total_cells if total_cells > 0 else 0
         
         stats_text = f"📦 Boxes: {num_boxes} | Occupied: {occupied} | Empty: {empty} | Capacity: {capacity}%"
@@ -1162,9 +1679,7 @@ class ASRSWindow(QMainWindow):
             logger.info(f"Box {box_id} location: ({target_row}, {target_col})")
             logger.debug(f"Calculating path from ({self.trolley_row}, {self.trolley_col}) to ({target_row}, {target_col})")
 
-            path = a_star_pathfinding(self.rack.grid,
-                                      (self.trolley_row, self.trolley_col),
-                                      (target_row, target_col))
+            path = self._astar((self.trolley_row, self.trolley_col), (target_row, target_col))
 
             logger.info(f"Path calculated - Distance: {len(path)} steps")
             self.start_retrieval_animation(box_id, (target_row, target_col), path, mode_name)
@@ -1183,15 +1698,16 @@ class ASRSWindow(QMainWindow):
             self.retrieving_box_id = box_id
             self.pending_position = position
             self.trolley_path = path
-            self.path_visualization = set(path)
+            self._path_idx = 0
+            self.path_visualization = frozenset(path)
             self.animation_cell_index = 0
             self.distance_traveled = len(path)
 
-            self.status_label.setText(f"🔄 RETRIEVAL ({mode_name}): Box #{box_id}")
+            self._set_status(f"🔄 RETRIEVAL ({mode_name}): Box #{box_id}")
             self.add_button.setEnabled(False)
             self.retrieve_button.setEnabled(False)
             self.update_grid_display()
-            self.animation_timer.start(150)
+            self._start_animation()
             logger.debug("Retrieval animation started")
         except Exception as e:
             logger.error(f"Error starting retrieval animation: {e}")
@@ -1202,28 +1718,15 @@ class ASRSWindow(QMainWindow):
         """
         Convert 'pcode-<n>' to (row, col). Supports plain numbers too.
         """
+        p = str(pcode_str).strip().lower().removeprefix("pcode-")
         try:
-            if not isinstance(pcode_str, str):
-                pcode_str = str(pcode_str)
-
-            p = pcode_str.strip().lower()
-            if not p.startswith("pcode-"):
-                p = f"pcode-{p}"
-
-            num = int(p.split("-", 1)[1])
-            if num <= 0:
-                return None
-
-            idx = num - 1
-            row = idx // GRID_COLS
-            col = idx % GRID_COLS
-
-            if 0 <= row < GRID_ROWS and 0 <= col < GRID_COLS:
-                return (row, col)
-            return None
-        except Exception as e:
+            num = int(p)
+        except ValueError as e:
             logger.error(f"Error in pcode_to_cell({pcode_str}): {e}")
             return None
+        if 0 < num <= len(PCODE_CELLS):
+            return PCODE_CELLS[num - 1]
+        return None
 
 
     def move_trolley_to_cell(self, row, col):
@@ -1241,22 +1744,23 @@ class ASRSWindow(QMainWindow):
                 # move one step right (or left if at border)
                 col = col + 1 if col + 1 < self.grid.cols else max(col - 1, 0)
 
-            path = a_star_pathfinding(self.rack.grid, (self.trolley_row, self.trolley_col), (row, col))
+            path = self._astar((self.trolley_row, self.trolley_col), (row, col))
             if not path:
                 QMessageBox.information(self, "No Path", f"Cannot find path to ({row},{col}).")
                 return False
 
             self.trolley_path = path
-            self.path_visualization = set(path)
+            self._path_idx = 0
+            self.path_visualization = frozenset(path)
             self.animation_cell_index = 0
             self.distance_traveled = len(path)
             self.operation_mode = 'goto_pcode'
             self.is_animating = True
-            self.status_label.setText(f"➡ Moving to {row},{col} (pcode)")
+            self._set_status(f"➡ Moving to {row},{col} (pcode)")
             self.add_button.setEnabled(False)
             self.retrieve_button.setEnabled(False)
             self.update_grid_display()
-            self.animation_timer.start(150)
+            self._start_animation()
             logger.info(f"Started moving trolley to pcode cell ({row},{col}) - steps: {len(path)}")
             return True
 
@@ -1281,132 +1785,11 @@ class ASRSWindow(QMainWindow):
     # -------------------------------------------------------------
 
     def animate(self):
-        """Animation loop (extended with 'goto_pcode' mode)"""
+        """Animation loop: one step of the current operation_mode"""
         try:
-            if self.operation_mode == 'storing_moving':
-                # existing storing_moving logic...
-                if self.trolley_path:
-                    next_row, next_col = self.trolley_path.pop(0)
-                    self.trolley_row = next_row
-                    self.trolley_col = next_col
-                    self.update_grid_display()
-
-                    if not self.trolley_path:
-                        self.operation_mode = 'storing_placing'
-                        self.animation_cell_index = 0
-                        self.animation_cells = []
-                        start_row, start_col = self.pending_position
-                        for r in range(start_row, start_row + self.pending_box.width):
-                            for c in range(start_col, start_col + self.pending_box.length):
-                                self.animation_cells.append((r, c))
-                        self.path_visualization.clear()
-                        self.status_label.setText(f"📦 Placing...")
-                        self.update_grid_display()
-
-            elif self.operation_mode == 'storing_placing':
-                if self.animation_cell_index < len(self.animation_cells):
-                    row, col = self.animation_cells[self.animation_cell_index]
-                    item = self.table.item(row, col)
-                    if item:
-                        item.setBackground(PLACING_COLOR)
-                        item.setText("📦")
-                    self.animation_cell_index += 1
-                else:
-                    self.rack.place_box(self.pending_box, self.pending_position[0], self.pending_position[1])
-                    db_box_id = add_box_to_db(self.pending_model_id)
-                    self.operation_mode = 'returning'
-                    self.trolley_path = a_star_pathfinding(self.rack.grid,
-                                                          (self.trolley_row, self.trolley_col),
-                                                          (ORIGIN_ROW, ORIGIN_COL))
-                    self.status_label.setText(f"🔄 Returning...")
-                    self.update_grid_display()
-
-            elif self.operation_mode == 'retrieving_moving':
-                if self.trolley_path:
-                    next_row, next_col = self.trolley_path.pop(0)
-                    self.trolley_row = next_row
-                    self.trolley_col = next_col
-                    self.update_grid_display()
-
-                    if not self.trolley_path:
-                        self.operation_mode = 'retrieving_picking'
-                        self.animation_cell_index = 0
-                        box = self.rack.boxes[self.retrieving_box_id]
-                        start_row, start_col = self.pending_position
-                        self.animation_cells = []
-                        for r in range(start_row, start_row + box.width):
-                            for c in range(start_col, start_col + box.length):
-                                self.animation_cells.append((r, c))
-                        self.path_visualization.clear()
-                        self.status_label.setText(f"🔄 Picking...")
-                        self.update_grid_display()
-
-            elif self.operation_mode == 'retrieving_picking':
-                if self.animation_cell_index < len(self.animation_cells):
-                    row, col = self.animation_cells[self.animation_cell_index]
-                    item = self.table.item(row, col)
-                    if item:
-                        item.setBackground(RETRIEVING_COLOR)
-                        item.setText("⬆️")
-                    self.animation_cell_index += 1
-                else:
-                    self.rack.remove_box(self.retrieving_box_id)
-                    self.operation_mode = 'returning'
-                    self.trolley_path = a_star_pathfinding(self.rack.grid,
-                                                          (self.trolley_row, self.trolley_col),
-                                                          (ORIGIN_ROW, ORIGIN_COL))
-                    self.status_label.setText(f"🔄 Returning...")
-                    self.update_grid_display()
-
-            elif self.operation_mode == 'returning':
-                if self.trolley_path:
-                    next_row, next_col = self.trolley_path.pop(0)
-                    self.trolley_row = next_row
-                    self.trolley_col = next_col
-                    self.update_grid_display()
-
-                    if not self.trolley_path:
-                        self.animation_timer.stop()
-                        self.is_animating = False
-
-                        if hasattr(self, 'pending_box') and self.pending_box:
-                            self.status_label.setText(f"✅ Box #{self.pending_box.box_id} stored!")
-                            log_operation(self.pending_box.box_id, 'STORED', self.distance_traveled)
-                            self.pending_box = None
-                        else:
-                            self.status_label.setText(f"✅ Box #{self.retrieving_box_id} retrieved!")
-                            log_operation(self.retrieving_box_id, 'RETRIEVED', self.distance_traveled)
-                            self.retrieving_box_id = None
-
-                        update_maintenance_cycles(self.distance_traveled)
-                        self.update_dashboard()
-                        self.operation_mode = 'idle'
-                        self.add_button.setEnabled(True)
-                        self.retrieve_button.setEnabled(True)
-                        self.update_grid_display()
-                        self.update_stats()
-                        save_game_state(self.rack)
-
-            elif self.operation_mode == 'goto_pcode':
-                # New mode: move the trolley along the path to the target pcode cell
-                if self.trolley_path:
-                    next_row, next_col = self.trolley_path.pop(0)
-                    self.trolley_row = next_row
-                    self.trolley_col = next_col
-                    self.update_grid_display()
-                    if not self.trolley_path:
-                        # reached destination
-                        self.animation_timer.stop()
-                        self.is_animating = False
-                        self.operation_mode = 'idle'
-                        self.add_button.setEnabled(True)
-                        self.retrieve_button.setEnabled(True)
-                        self.status_label.setText(f"✅ Arrived at target ({self.trolley_row},{self.trolley_col})")
-                        self.update_grid_display()
-                        self.update_stats()
-                        # do not modify rack state (we just moved trolley)
-                # else: nothing to do if no path
-
+            handler = self._mode_handlers.get(self.operation_mode)
+            if handler is not None:
+                handler()
         except Exception as e:
             logger.error(f"CRITICAL ERROR IN ANIMATE: {e}")
             logger.error(f"Operation mode: {self.operation_mode}")
@@ -1420,7 +1803,115 @@ class ASRSWindow(QMainWindow):
             self.add_button.setEnabled(True)
             self.retrieve_button.setEnabled(True)
             QMessageBox.critical(self, "Animation Error", f"Critical error during animation:\n{str(e)}")
-    
+
+    def _step_trolley(self):
+        """Move the trolley one cell along trolley_path; True while cells remain
+
+        An empty or used-up path returns False at once, so the caller moves on
+        to the next phase in the same tick instead of stalling.
+        """
+        if self._path_idx < len(self.trolley_path):
+            self.trolley_row, self.trolley_col = self.trolley_path[self._path_idx]
+            self._path_idx += 1
+            self.update_grid_display()
+        return self._path_idx < len(self.trolley_path)
+
+    def _animate_storing_moving(self):
+        """Move one step towards the storage slot"""
+        if self._step_trolley():
+            return
+        self.operation_mode = 'storing_placing'
+        self.animation_cell_index = 0
+        self.animation_cells = self.pending_box.cells(*self.pending_position)
+        self.path_visualization = frozenset()
+        self._set_status(STATUS_PLACING)
+        self.update_grid_display()
+
+    def _animate_storing_placing(self):
+        """Paint the next box cells, then place the box and head home"""
+        if self.animation_cell_index < len(self.animation_cells):
+            end = self.animation_cell_index + ANIMATION_CELLS_PER_STEP
+            for row, col in self.animation_cells[self.animation_cell_index:end]:
+                self.rack_model.set_overlay(row, col, PLACING_BRUSH, "📦")
+            self.animation_cell_index = end
+        else:
+            self.rack.place_box(self.pending_box, self.pending_position[0], self.pending_position[1])
+            queue_box(self.pending_model_id, self.pending_box.box_id,
+                      self.distance_traveled)
+            self.operation_mode = 'returning'
+            self.trolley_path = self._astar((self.trolley_row, self.trolley_col), (ORIGIN_ROW, ORIGIN_COL))
+            self._path_idx = 0
+            self._set_status(STATUS_RETURNING)
+            self.update_grid_display()
+
+    def _animate_retrieving_moving(self):
+        """Move one step towards the box being retrieved"""
+        if self._step_trolley():
+            return
+        self.operation_mode = 'retrieving_picking'
+        self.animation_cell_index = 0
+        box = self.rack.boxes[self.retrieving_box_id]
+        self.animation_cells = box.cells(*self.pending_position)
+        self.path_visualization = frozenset()
+        self._set_status(STATUS_PICKING)
+        self.update_grid_display()
+
+    def _animate_retrieving_picking(self):
+        """Paint the next box cells, then remove the box and head home"""
+        if self.animation_cell_index < len(self.animation_cells):
+            end = self.animation_cell_index + ANIMATION_CELLS_PER_STEP
+            for row, col in self.animation_cells[self.animation_cell_index:end]:
+                self.rack_model.set_overlay(row, col, RETRIEVING_BRUSH, "⬆️")
+            self.animation_cell_index = end
+        else:
+            self.rack.remove_box(self.retrieving_box_id)
+            self.operation_mode = 'returning'
+            self.trolley_path = self._astar((self.trolley_row, self.trolley_col), (ORIGIN_ROW, ORIGIN_COL))
+            self._path_idx = 0
+            self._set_status(STATUS_RETURNING)
+            self.update_grid_display()
+
+    def _animate_returning(self):
+        """Move one step home; finish the operation on arrival"""
+        if self._step_trolley():
+            return
+        self.animation_timer.stop()
+        self.is_animating = False
+
+        if hasattr(self, 'pending_box') and self.pending_box:
+            self._set_status(f"✅ Box #{self.pending_box.box_id} stored!")
+            self.pending_box = None
+        else:
+            self._set_status(f"✅ Box #{self.retrieving_box_id} retrieved!")
+            log_operation(self.retrieving_box_id, 'RETRIEVED', self.distance_traveled)
+            self.retrieving_box_id = None
+
+        # box/log rows and the maintenance counters commit together
+        update_maintenance_cycles(self.distance_traveled)
+        flush_ops()
+        self.update_dashboard()
+        self.operation_mode = 'idle'
+        self.add_button.setEnabled(True)
+        self.retrieve_button.setEnabled(True)
+        self.update_grid_display()
+        self.update_stats()
+        save_game_state(self.rack, background=True)
+
+    def _animate_goto_pcode(self):
+        """Move one step towards the target pcode cell"""
+        if self._step_trolley():
+            return
+        # reached destination
+        self.animation_timer.stop()
+        self.is_animating = False
+        self.operation_mode = 'idle'
+        self.add_button.setEnabled(True)
+        self.retrieve_button.setEnabled(True)
+        self._set_status(f"✅ Arrived at target ({self.trolley_row},{self.trolley_col})")
+        self.update_grid_display()
+        self.update_stats()
+        # do not modify rack state (we just moved trolley)
+
     def save_state(self):
         """Save state"""
         if save_game_state(self.rack):
@@ -1438,16 +1929,19 @@ class ASRSWindow(QMainWindow):
                 
                 # Clear in-memory rack
                 self.rack = Rack(GRID_ROWS, GRID_COLS)
+                self._path_cache.clear()
                 
-                # Delete save file
+                # Delete save file (after any queued write has landed)
+                wait_for_saves()
                 if os.path.exists(SAVE_FILE):
                     os.remove(SAVE_FILE)
                 
                 # Reset trolley
                 self.trolley_row = ORIGIN_ROW
                 self.trolley_col = ORIGIN_COL
-                self.path_visualization.clear()
+                self.path_visualization = frozenset()
                 self.trolley_path = []
+                self._path_idx = 0
                 
                 # Reset animation state
                 self.is_animating = False
@@ -1465,7 +1959,7 @@ class ASRSWindow(QMainWindow):
                 self.add_button.setEnabled(True)
                 self.retrieve_button.setEnabled(True)
                 
-                self.status_label.setText("✅ Rack completely reset!")
+                self._set_status(STATUS_RESET)
                 QMessageBox.information(self, "Reset Complete", "✅ All data cleared!\n\n✓ Boxes deleted\n✓ Dashboard reset\n✓ Cycles reset to 0")
                 
             except Exception as e:
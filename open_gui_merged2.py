@@ -5,25 +5,41 @@
 import sys
 import os
 import traceback
+import logging
+import shiboken6
+import time
+import functools
+import importlib
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton, QLabel, QLineEdit,
     QVBoxLayout, QHBoxLayout, QStackedWidget, QMessageBox, QFrame,
-    QGridLayout, QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar,
-    QSizePolicy, QDialog, QComboBox, QTextEdit, QInputDialog
+    QTableView, QDialog, QComboBox, QPlainTextEdit, QInputDialog
 )
-from PySide6.QtCore import Qt, QTimer, QDateTime
+from PySide6.QtCore import Qt, QTimer, QDateTime, QProcess
 from PySide6.QtGui import QFont
 
-# ---------- ASRS (game) code imports (SAFE) ----------
+logger = logging.getLogger(__name__)
+
+# ---------- ASRS (game) code imports (SAFE, deferred) ----------
 _game3_error = None
-_game3_loaded = False
-try:
-    # We only need read APIs; do NOT merge code, just use callbacks.
-    from game_3 import load_game_state, get_all_models, ASRSWindow
-    _game3_loaded = True
-except Exception as _e:
-    _game3_error = traceback.format_exc()
-    _game3_loaded = False
+
+@functools.lru_cache(maxsize=None)
+def _load_game3():
+    """
+    Import game_3 on first use - it pulls in numpy/numba, which would otherwise
+    dominate startup. Returns the module, or None with the traceback in _game3_error.
+    """
+    global _game3_error
+    try:
+        # We only need read APIs; do NOT merge code, just use callbacks.
+        import game_3
+        return game_3
+    except Exception:
+        _game3_error = traceback.format_exc()
+        return None
+
+# Seconds a model list read from ASRS is reused by the handlers
+MODELS_CACHE_TTL = 5.0
 
 # Expected files (make sure these filenames exactly match files in the folder)
 EXPECTED_MODULES = [
@@ -39,69 +55,100 @@ EXPECTED_MODULES = [
 ]
 
 def check_required_files():
-    missing = []
     cwd = os.path.dirname(os.path.abspath(__file__))
-    for fname in EXPECTED_MODULES:
-        if not os.path.exists(os.path.join(cwd, fname)):
-            missing.append(fname)
-    return missing
-
-# Submodule holders and error dict
+    # one directory listing instead of a stat per expected file
+    with os.scandir(cwd) as entries:
+        present = {e.name for e in entries}
+    return [fname for fname in EXPECTED_MODULES if fname not in present]
+
+# Submodule window classes, imported on first use (see _load_window_class)
+SUBMODULE_CLASSES = {
+    "tray_config_window": "TrayConfigWindow",
+    "call_tray_details": "CallTrayDetailsWindow",
+    "inventory_list": "InventoryListWindow",
+    "tray_data": "TrayDataWindow",
+    "tray_partition": "TrayPartitionWindow",
+    "settings_window": "SettingsWindow",
+    "machine_status": "MachineStatusWindow",
+    "available_space": "AvailableSpaceWindow",
+    "material_tracking": "MaterialTrackingWindow",
+}
+
+# Submodule error dict (module name -> exception, or a message string)
 _submodule_errors = {}
-TrayConfigWindow = None
-CallTrayDetailsWindow = None
-InventoryListWindow = None
-TrayDataWindow = None
-TrayPartitionWindow = None
-SettingsWindow = None
-MachineStatusWindow = None
-AvailableSpaceWindow = None
-MaterialTrackingWindow = None
-
-# Attempt imports safely and store tracebacks for diagnostics
+
+
+def _format_submodule_error(err):
+    """Text for a _submodule_errors value; tracebacks are only formatted when shown"""
+    if isinstance(err, BaseException):
+        return "".join(traceback.format_exception(type(err), err, err.__traceback__))
+    return err
+
 missing_files = check_required_files()
 if missing_files:
     _submodule_errors["missing_files"] = "Missing module files:\n" + "\n".join(missing_files)
-else:
-    try:
-        from tray_config_window import TrayConfigWindow
-    except Exception:
-        _submodule_errors["tray_config_window"] = traceback.format_exc()
-    try:
-        from call_tray_details import CallTrayDetailsWindow
-    except Exception:
-        _submodule_errors["call_tray_details"] = traceback.format_exc()
-    try:
-        from inventory_list import InventoryListWindow
-    except Exception:
-        _submodule_errors["inventory_list"] = traceback.format_exc()
-    try:
-        from tray_data import TrayDataWindow
-    except Exception:
-        _submodule_errors["tray_data"] = traceback.format_exc()
-    try:
-        from tray_partition import TrayPartitionWindow
-    except Exception:
-        _submodule_errors["tray_partition"] = traceback.format_exc()
-    try:
-        from settings_window import SettingsWindow
-    except Exception:
-        _submodule_errors["settings_window"] = traceback.format_exc()
-    try:
-        from machine_status import MachineStatusWindow
-    except Exception:
-        _submodule_errors["machine_status"] = traceback.format_exc()
-    try:
-        from available_space import AvailableSpaceWindow
-    except Exception:
-        _submodule_errors["available_space"] = traceback.format_exc()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_window_class(module_name):
+    """
+    Import a submodule the first time its window is needed and return its class.
+    Returns None if files are missing or the import fails (exception stored for diagnostics).
+    """
+    if "missing_files" in _submodule_errors:
+        return None
     try:
-        from material_tracking import MaterialTrackingWindow
-    except Exception:
-        _submodule_errors["material_tracking"] = traceback.format_exc()
+        return getattr(importlib.import_module(module_name), SUBMODULE_CLASSES[module_name])
+    except Exception as e:
+        _submodule_errors[module_name] = e
+        return None
+
+
+# window class name -> submodule name, for the module-level __getattr__ below
+_CLASS_MODULES = {cls_name: mod for mod, cls_name in SUBMODULE_CLASSES.items()}
+
+def __getattr__(name):
+    """
+    Keep `open_gui_merged2.TrayConfigWindow` etc. working now that the classes are
+    no longer module globals: resolved (or None, as before) on first access.
+    """
+    module_name = _CLASS_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _load_window_class(module_name)
+
+
+# Optional InventoryListWindow helpers, tried in this order by the Product Code flow
+INVENTORY_HOOKS = (
+    "filter_table_by_product_code",
+    "select_row_for_product",
+    "set_search_field",
+    "apply_search",
+    "apply_filter",
+)
+
+@functools.lru_cache(maxsize=None)
+def _inventory_hooks(cls):
+    """Names from INVENTORY_HOOKS that cls implements (probed once per class)"""
+    return frozenset(name for name in INVENTORY_HOOKS if hasattr(cls, name))
 
 
 class MainWindow(QMainWindow):
+    # Home-page action tiles: (label, colour, submodule key, friendly title)
+    TILES = (
+        ("Tray Data", "#63c7f2", "tray_data", "Tray Data"),
+        ("Inventory List", "#6dedb6", "inventory_list", "Inventory List"),
+        ("Material\nTracking", "#f58356", "material_tracking", "Material Tracking"),
+        ("Available\nSpace", "#f2d36d", "available_space", "Available Space"),
+        ("Call Tray\nDetails", "#9ef056", "call_tray_details", "Call Tray Details"),
+        ("Machine\nStatus", "#4a9bf7", "machine_status", "Machine Status"),
+        ("Tray\nConfiguration", "#66bb6a", "tray_config_window", "Tray Configuration"),
+        ("Tray\nPartition", "#9b63eb", "tray_partition", "Tray Partition"),
+    )
+
+    # Clock label font, built on first MainWindow (needs a QApplication) and shared
+    _clock_font = None
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("ABB Project - Home Page (Robust Loader)")
@@ -128,9 +175,24 @@ class MainWindow(QMainWindow):
         # 🟩 Top Bar Section
         # ================================
         top_bar_container = QWidget()
+        # one sheet for the bar and its icon buttons ('*' = the bar and everything in it)
         top_bar_container.setStyleSheet("""
-            background-color: #21cc93;
-            border-radius: 10px;
+            * {
+                background-color: #21cc93;
+                border-radius: 10px;
+            }
+            QPushButton[role="topIcon"] {
+                background-color: #EDEFF2;
+                color: #333333;
+                font-size: 20px;
+                font-weight: bold;
+                border: none;
+                border-radius: 8px;
+            }
+            QPushButton[role="topIcon"]:hover {
+                background-color: #f57c00;
+                color: white;
+            }
         """)
         top_bar_layout = QHBoxLayout(top_bar_container)
         top_bar_layout.setContentsMargins(10, 6, 10, 6)
@@ -138,7 +200,9 @@ class MainWindow(QMainWindow):
 
         # Timestamp label (left side)
         self.datetime_label = QLabel()
-        self.datetime_label.setFont(QFont("Arial", 10, QFont.Bold))
+        if MainWindow._clock_font is None:
+            MainWindow._clock_font = QFont("Arial", 10, QFont.Bold)
+        self.datetime_label.setFont(MainWindow._clock_font)
         self.datetime_label.setStyleSheet("color: white;")
         top_bar_layout.addWidget(self.datetime_label, alignment=Qt.AlignLeft)
 
@@ -152,20 +216,7 @@ class MainWindow(QMainWindow):
             b = QPushButton(sym)
             b.setToolTip(tip)
             b.setFixedSize(48, 48)
-            b.setStyleSheet("""
-                QPushButton {
-                    background-color: #EDEFF2;
-                    color: #333333;
-                    font-size: 20px;
-                    font-weight: bold;
-                    border: none;
-                    border-radius: 8px;
-                }
-                QPushButton:hover {
-                    background-color: #f57c00;
-                    color: white;
-                }
-            """)
+            b.setProperty("role", "topIcon")  # styled by the top bar's sheet
             if cb:
                 b.clicked.connect(cb)
             return b
@@ -189,10 +240,11 @@ class MainWindow(QMainWindow):
         # Add top bar to main layout
         root.addWidget(top_bar_container)
 
-        # clock update
-        timer = QTimer(self)
-        timer.timeout.connect(self._update_clock)
-        timer.start(1000)
+        # clock update: single-shot timer re-armed for each whole second while shown
+        self._clock_timer = QTimer(self)
+        self._clock_timer.setSingleShot(True)
+        self._clock_timer.setTimerType(Qt.PreciseTimer)
+        self._clock_timer.timeout.connect(self._update_clock)
         self._update_clock()
 
         # show a warning if some submodules failed to load
@@ -210,26 +262,47 @@ class MainWindow(QMainWindow):
         root.addWidget(self.stack, 1)
 
         self.home_page = self._build_home_page()
-        self.settings_page = self._build_settings_page()
-
-        for p in (self.home_page, self.settings_page):
-            self.stack.addWidget(p)
+        self.stack.addWidget(self.home_page)
         self.stack.setCurrentWidget(self.home_page)
 
-        # store created subwindows
+        # other pages are built on first use by show_page(key)
+        self._page_factories = {"settings": self._build_settings_page}
+        self._pages = {"home": self.home_page}
+
+        # one window per submodule name, reused by _show_tray_window
         self._tray_windows = {}
 
-        # Pre-cache model list from ASRS (if available)
+        # subwindow open errors, shown together in one non-modal box by _flush_errors
+        self._error_queue = []  # list[(title, message)]
+        self._error_timer = QTimer(self)
+        self._error_timer.setSingleShot(True)
+        self._error_timer.setInterval(0)
+        self._error_timer.timeout.connect(self._flush_errors)
+
+        # Model list from ASRS, (re)loaded by _reload_models when a handler needs it
         self._model_list = []  # list[(id, name)]
-        if _game3_loaded:
-            try:
-                self._model_list = get_all_models()
-            except Exception:
-                # keep empty; handlers will try again and show friendly msg
-                pass
+        self._models_loaded_at = 0.0
+        self._model_id_to_name = {}
+        self._model_name_to_id = {}
+        self._model_by_lower_name = {}
 
     def _update_clock(self):
-        self.datetime_label.setText(QDateTime.currentDateTime().toString("dddd, MMMM d, yyyy  hh:mm:ss AP"))
+        now = QDateTime.currentDateTime()
+        text = now.toString("dddd, MMMM d, yyyy  hh:mm:ss AP")
+        if text != self.datetime_label.text():
+            self.datetime_label.setText(text)
+        if self.isVisible():
+            # fire just after the next second boundary instead of drifting
+            self._clock_timer.start(1000 - now.time().msec())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_clock()
+
+    def hideEvent(self, event):
+        # no clock ticks while hidden or minimized; showEvent catches up
+        self._clock_timer.stop()
+        super().hideEvent(event)
 
     # =================== HOME PAGE ===================
     def _build_home_page(self):
@@ -317,7 +390,10 @@ class MainWindow(QMainWindow):
         # Right card: Child Part, Model, Search + Master Data / Sample Format
         right_card = QFrame()
         right_card.setFrameShape(QFrame.StyledPanel)
-        right_card.setStyleSheet("background: #f75e75; border-radius:10px;")
+        right_card.setStyleSheet(
+            "* { background: #f75e75; border-radius:10px; }"
+            "QPushButton[role=\"cardAction\"] { background:#63c7f2; color:white; font-weight:700; border-radius:8px; }"
+        )
         right_layout = QVBoxLayout(right_card)
         right_layout.setContentsMargins(18, 18, 18, 18)
         right_layout.setSpacing(10)
@@ -347,13 +423,13 @@ class MainWindow(QMainWindow):
         right_buttons_col.setSpacing(10)
         btn_search = QPushButton("Search")
         btn_search.setFixedSize(100, 80)
-        btn_search.setStyleSheet("background:#63c7f2; color:white; font-weight:700; border-radius:8px;")
+        btn_search.setProperty("role", "cardAction")
         btn_master = QPushButton("Master Data")
         btn_master.setFixedSize(120, 44)
-        btn_master.setStyleSheet("background:#63c7f2; color:white; font-weight:700; border-radius:8px;")
+        btn_master.setProperty("role", "cardAction")
         btn_sample = QPushButton("Sample Format")
         btn_sample.setFixedSize(120, 44)
-        btn_sample.setStyleSheet("background:#63c7f2; color:white; font-weight:700; border-radius:8px;")
+        btn_sample.setProperty("role", "cardAction")
 
         # Placeholders (unchanged)
         btn_search.clicked.connect(lambda: QMessageBox.information(self, "Search", "Search (placeholder)"))
@@ -379,7 +455,6 @@ class MainWindow(QMainWindow):
 
         # ---------- Bottom icon row (square action tiles) ----------
         tiles_frame = QFrame()
-        tiles_frame.setStyleSheet("background: transparent;")
         tiles_layout = QHBoxLayout(tiles_frame)
         tiles_layout.setSpacing(14)
         tiles_layout.setContentsMargins(6, 6, 6, 6)
@@ -387,39 +462,43 @@ class MainWindow(QMainWindow):
         def mk_tile(title, color, cb=None, w=120, h=120):
             b = QPushButton(title)
             b.setFixedSize(w, h)
-            b.setStyleSheet(f"""
-                QPushButton {{
-                    background: {color};
-                    color: white;
-                    font-weight:700;
-                    border-radius:10px;
-                    font-size:13px;
-                }}
-                QPushButton:pressed {{ background: #222; }}
-            """)
+            b.setProperty("tileColor", color)  # styled by the tile row's sheet
             if cb:
                 b.clicked.connect(cb)
             return b
 
-        tiles = [
-            ("Tray Data", "#63c7f2", lambda: self._safe_open("tray_data", "Tray Data", TrayDataWindow)),
-            ("Inventory List", "#6dedb6", lambda: self._safe_open("inventory_list", "Inventory List", InventoryListWindow)),
-            ("Material\nTracking", "#f58356", lambda: self._safe_open("material_tracking", "Material Tracking", MaterialTrackingWindow)),
-            ("Available\nSpace", "#f2d36d", lambda: self._safe_open("available_space", "Available Space", AvailableSpaceWindow)),
-            ("Call Tray\nDetails", "#9ef056", lambda: self._safe_open("call_tray_details", "Call Tray Details", CallTrayDetailsWindow)),
-            ("Machine\nStatus", "#4a9bf7", lambda: self.open_machine_status_window()),
-            ("Tray\nConfiguration", "#66bb6a", lambda: self._safe_open("tray_config_window", "Tray Configuration", TrayConfigWindow)),
-            ("Tray\nPartition", "#9b63eb", lambda: self._safe_open("tray_partition", "Tray Partition", TrayPartitionWindow)),
-        ]
-
-        for title, color, cb in tiles:
-            tiles_layout.addWidget(mk_tile(title, color, cb))
+        # one sheet for the row and all tiles, with a rule per tile colour
+        tile_colors = "".join(
+            f'QPushButton[tileColor="{color}"] {{ background: {color}; }}\n'
+            for color in dict.fromkeys(color for _, color, _, _ in self.TILES)
+        )
+        tiles_frame.setStyleSheet(f"""
+            * {{ background: transparent; }}
+            QPushButton[tileColor] {{
+                color: white;
+                font-weight:700;
+                border-radius:10px;
+                font-size:13px;
+            }}
+            {tile_colors}
+            QPushButton[tileColor]:pressed {{ background: #222; }}
+        """)
+        for title, color, key, friendly in self.TILES:
+            tiles_layout.addWidget(mk_tile(title, color, functools.partial(self._safe_open, key, friendly)))
 
         page_layout.addWidget(tiles_frame)
 
         page_layout.addStretch(1)
         return page
 
+    def show_page(self, key):
+        """Switch the stack to page key, building and adding it the first time"""
+        page = self._pages.get(key)
+        if page is None:
+            page = self._pages[key] = self._page_factories[key]()
+            self.stack.addWidget(page)
+        self.stack.setCurrentWidget(page)
+
     # =================== SETTINGS PAGE ===================
     def _build_settings_page(self):
         page = QWidget()
@@ -433,18 +512,26 @@ class MainWindow(QMainWindow):
 
     # =================== ASRS CALLBACKS ===================
     def _ensure_game_loaded(self) -> bool:
-        if not _game3_loaded:
+        if _load_game3() is None:
             QMessageBox.critical(self, "ASRS unavailable",
                                  "game_3.py could not be loaded.\n\nDetails:\n" + (_game3_error or "Unknown import error"))
             return False
         return True
 
     def _reload_models(self):
+        # reuse a recent list; the ASRS window runs as its own process and may add models
+        if self._model_list and time.monotonic() - self._models_loaded_at < MODELS_CACHE_TTL:
+            return
         try:
-            self._model_list = get_all_models()
+            self._model_list = _load_game3().get_all_models(refresh=True)
         except Exception as e:
             self._model_list = []
             raise e
+        self._models_loaded_at = time.monotonic()
+        # lookups used by the handlers, built once per refresh
+        self._model_id_to_name = dict(self._model_list)
+        self._model_name_to_id = {mname: mid for (mid, mname) in self._model_list}
+        self._model_by_lower_name = {mname.lower(): (mid, mname) for (mid, mname) in self._model_list}
 
     def _choose_model_no(self):
         """Open a tiny dialog to pick a model number from ASRS, then fill the input."""
@@ -474,7 +561,7 @@ class MainWindow(QMainWindow):
                 self.tray_number_edit.setText(combo.currentText())
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load models:\n{e}")
-            print(traceback.format_exc())
+            logger.exception("Failed to load models")
 
     def _show_model_tray_info(self):
         """
@@ -486,20 +573,16 @@ class MainWindow(QMainWindow):
         try:
             # Load models and rack
             self._reload_models()
-            rack = load_game_state()
+            rack = _load_game3().load_game_state()
             if rack is None:
                 QMessageBox.information(self, "No ASRS state",
                                         "No saved ASRS state found yet.\nAdd/store boxes in the ASRS screen first.")
                 return
 
             # Build counts
-            id_to_name = {mid: mname for (mid, mname) in self._model_list}
-            counts = {}
-            for bid, box in rack.boxes.items():
-                m_id = getattr(box, "model_id", None)
-                if m_id is None:
-                    continue
-                counts[m_id] = counts.get(m_id, 0) + 1
+            id_to_name = self._model_id_to_name
+            # the rack keeps box ids grouped per model (rebuilt on load)
+            counts = {m_id: len(bids) for m_id, bids in rack.by_model.items() if m_id is not None}
 
             if not counts:
                 QMessageBox.information(self, "No trays", "No trays/boxes stored in the current ASRS state.")
@@ -515,7 +598,7 @@ class MainWindow(QMainWindow):
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to read ASRS state:\n{e}")
-            print(traceback.format_exc())
+            logger.exception("Failed to read ASRS state")
 
     def _fetch_model_from_asrs(self):
         """
@@ -533,33 +616,25 @@ class MainWindow(QMainWindow):
 
             # Ensure latest models and find the model_id by name
             self._reload_models()
-            name_to_id = {mname: mid for (mid, mname) in self._model_list}
-            if model_name not in name_to_id:
-                # allow case-insensitive fallback
-                lower_map = {mname.lower(): mid for (mid, mname) in self._model_list}
-                if model_name.lower() in lower_map:
-                    model_id = lower_map[model_name.lower()]
-                    # fix user-visible name to exact casing
-                    for n, mid in name_to_id.items():
-                        if mid == model_id:
-                            model_name = n
-                            break
-                else:
+            model_id = self._model_name_to_id.get(model_name)
+            if model_id is None:
+                # allow case-insensitive fallback (and fix user-visible name to exact casing)
+                match = self._model_by_lower_name.get(model_name.lower())
+                if match is None:
                     QMessageBox.warning(self, "Unknown model",
                                         f"Model '{model_name}' not found in ASRS models.\nUse 'Model No' to choose.")
                     return
-            else:
-                model_id = name_to_id[model_name]
+                model_id, model_name = match
 
             # Load ASRS state (Rack with positions)
-            rack = load_game_state()
+            rack = _load_game3().load_game_state()
             if rack is None:
                 QMessageBox.information(self, "No ASRS state",
                                         "No saved ASRS state found yet.\nStore boxes for this model in ASRS first.")
                 return
 
             # Collect all box_ids for this model and their positions
-            box_ids = [bid for bid, box in rack.boxes.items() if getattr(box, "model_id", None) == model_id]
+            box_ids = rack.get_boxes_by_model(model_id)
             if not box_ids:
                 QMessageBox.information(self, "No trays",
                                         f"No trays found for model '{model_name}'.")
@@ -569,12 +644,12 @@ class MainWindow(QMainWindow):
             lines = [f"Model: {model_name} (ID {model_id})",
                      f"Total trays: {len(box_ids)}",
                      "Placement locations (row, col):"]
-            for bid in sorted(box_ids):
-                pos = rack.box_positions.get(bid)
-                if pos:
-                    lines.append(f"  • Tray #{bid} -> ({pos[0]}, {pos[1]})")
-                else:
-                    lines.append(f"  • Tray #{bid} -> <position not recorded>")
+            get_pos = rack.box_positions.get
+            lines.extend(
+                f"  • Tray #{bid} -> ({pos[0]}, {pos[1]})" if (pos := get_pos(bid))
+                else f"  • Tray #{bid} -> <position not recorded>"
+                for bid in sorted(box_ids)
+            )
 
             msg = "\n".join(lines)
 
@@ -582,10 +657,11 @@ class MainWindow(QMainWindow):
             dlg = QDialog(self)
             dlg.setWindowTitle("Fetch Model Result")
             v = QVBoxLayout(dlg)
-            out = QTextEdit()
+            out = QPlainTextEdit()
             out.setReadOnly(True)
+            out.setUndoRedoEnabled(False)
             out.setMinimumSize(520, 320)
-            out.setText(msg)
+            out.setPlainText(msg)
             v.addWidget(out)
             btns = QHBoxLayout()
             ok = QPushButton("OK")
@@ -596,7 +672,7 @@ class MainWindow(QMainWindow):
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to fetch model info:\n{e}")
-            print(traceback.format_exc())
+            logger.exception("Failed to fetch model info")
 
     # =================== New Product / Inventory Handlers ===================
     def _choose_product_code(self):
@@ -607,7 +683,7 @@ class MainWindow(QMainWindow):
         code, ok = QInputDialog.getText(self, "Select Product Code", "Enter product code:")
         if ok and code:
             self.product_code_edit.setText(code)
-            print(f"Product code selected: {code}")
+            logger.info(f"Product code selected: {code}")
             self._open_inventory_list_with_product(code)
 
     def _choose_serial_number(self):
@@ -615,7 +691,7 @@ class MainWindow(QMainWindow):
         serial, ok = QInputDialog.getText(self, "Select Serial Number", "Enter serial number:")
         if ok and serial:
             self.product_code_edit.setText(serial)  # or use a separate field if desired
-            print(f"Serial number selected: {serial}")
+            logger.info(f"Serial number selected: {serial}")
             self._open_inventory_list_with_product(serial)
 
     def _fetch_product_from_asrs(self):
@@ -627,7 +703,7 @@ class MainWindow(QMainWindow):
         if not product_code:
             QMessageBox.warning(self, "Missing Input", "Please enter or select a product code first.")
             return
-        print(f"Fetching product info for: {product_code}")
+        logger.info(f"Fetching product info for: {product_code}")
         # Optionally reuse earlier model-fetch flow (if logic expects model names):
         # We'll call _fetch_model_from_asrs() if appropriate (keeps old behavior).
         try:
@@ -635,7 +711,7 @@ class MainWindow(QMainWindow):
             self._fetch_model_from_asrs()
         except Exception:
             # don't break on ASRS errors here; show friendly message
-            print("Warning: _fetch_model_from_asrs raised an exception:", traceback.format_exc())
+            logger.exception("_fetch_model_from_asrs raised an exception")
 
         # After fetch (or regardless), open inventory and highlight
         self._open_inventory_list_with_product(product_code)
@@ -652,7 +728,7 @@ class MainWindow(QMainWindow):
 
         if not code:
             # If ASRS available, allow picking a model number then use it
-            if _game3_loaded:
+            if _load_game3() is not None:
                 self._choose_model_no()
                 code = (self.product_code_edit.text() or "").strip()
             if not code:
@@ -664,20 +740,23 @@ class MainWindow(QMainWindow):
 
         # ✅ --- Launch ASRS window (separate process) ---
         try:
-            import subprocess, sys, os
             game3_path = os.path.join(os.path.dirname(__file__), "game_3.py")
 
-            # If user entered a product code, send it to ASRS
-            if code:
-                subprocess.Popen([sys.executable, game3_path, code])
-                print(f"✅ ASRS launched with product code {code}")
+            # If user entered a product code, send it to ASRS.
+            # startDetached returns without waiting for the child to start up.
+            args = [game3_path, code] if code else [game3_path]
+            started, _pid = QProcess.startDetached(sys.executable, args)
+            if not started:
+                logger.error(f"❌ Error launching ASRS: could not start {sys.executable}")
+            elif code:
+                logger.info(f"✅ ASRS launched with product code {code}")
             else:
-                subprocess.Popen([sys.executable, game3_path])
-                print("✅ ASRS window launched (no product code).")
-        except Exception as e:
-            print("❌ Error launching ASRS:", e)
+                logger.info("✅ ASRS window launched (no product code).")
+        except Exception:
+            logger.exception("❌ Error launching ASRS")
 
         # ✅ --- Continue showing Inventory List as before ---
+        InventoryListWindow = _load_window_class("inventory_list")
         if self._show_import_problem("inventory_list"):
             return
         if InventoryListWindow is None:
@@ -685,40 +764,39 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            inv = InventoryListWindow(self)
-            self._tray_windows["inventory"] = inv
-            inv.show()
+            inv = self._show_tray_window("inventory_list", lambda: InventoryListWindow(self))
+            hooks = _inventory_hooks(type(inv))
 
             # Try standard helper names if implemented in inventory_list.py
-            if hasattr(inv, "filter_table_by_product_code"):
+            if "filter_table_by_product_code" in hooks:
                 try:
                     inv.filter_table_by_product_code(code)
                     return
                 except Exception:
-                    print("filter_table_by_product_code failed:", traceback.format_exc())
+                    logger.exception("filter_table_by_product_code failed")
 
-            if hasattr(inv, "select_row_for_product"):
+            if "select_row_for_product" in hooks:
                 try:
                     inv.select_row_for_product(code)
                     return
                 except Exception:
-                    print("select_row_for_product failed:", traceback.format_exc())
+                    logger.exception("select_row_for_product failed")
 
-            if hasattr(inv, "set_search_field"):
+            if "set_search_field" in hooks:
                 try:
                     inv.set_search_field(code)
-                    if hasattr(inv, "apply_search"):
+                    if "apply_search" in hooks:
                         inv.apply_search()
                     return
                 except Exception:
-                    print("set_search_field/apply_search failed:", traceback.format_exc())
+                    logger.exception("set_search_field/apply_search failed")
 
-            if hasattr(inv, "apply_filter"):
+            if "apply_filter" in hooks:
                 try:
                     inv.apply_filter({"product_code": code})
                     return
                 except Exception:
-                    print("apply_filter failed:", traceback.format_exc())
+                    logger.exception("apply_filter failed")
 
             try:
                 if hasattr(inv, "product_code_edit"):
@@ -728,83 +806,125 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
-            if hasattr(inv, "table") and isinstance(inv.table, QTableWidget):
-                self._highlight_product_row(inv.table, code)
+            # any table view will do (it needs model()/selectRow/scrollTo)
+            tbl = getattr(inv, "table", None)
+            if tbl is not None and getattr(tbl, "selectRow", None) is not None:
+                self._highlight_product_row(tbl, code)
                 return
 
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open Inventory window:\n{e}")
-            print(traceback.format_exc())
+            self._queue_error("Error", f"Failed to open Inventory window:\n{e}")
+            logger.exception("Failed to open Inventory window")
 
 
-    def _highlight_product_row(self, table: QTableWidget, product_code: str):
+    def _highlight_product_row(self, table: QTableView, product_code: str):
         """
         Generic fallback highlight: finds first row where the 'Product Code' column contains product_code (case-insensitive)
         and selects & scrolls to it.
+        Works on any QTableView (QTableWidget or a view over an item model).
         """
+        pc_col_idx = self._product_code_column(table)
+
+        # first case-insensitive substring hit in that column, searched by Qt in C++
+        model = table.model()
+        hits = model.match(model.index(0, pc_col_idx), Qt.DisplayRole, product_code, 1, Qt.MatchContains)
+
+        if hits:
+            table.selectRow(hits[0].row())
+            table.scrollTo(hits[0], QTableView.PositionAtCenter)
+
+    @staticmethod
+    def _is_product_code_header(model, col):
+        h = str(model.headerData(col, Qt.Horizontal, Qt.DisplayRole) or "").lower()
+        return "product" in h and "code" in h
+
+    def _product_code_column(self, table: QTableView):
+        """
+        Index of the 'Product Code' column. A found index is remembered on the table
+        and only re-checked against its own header, not rescanned.
+        """
+        model = table.model()
+        ncols = model.columnCount()
+        cached = getattr(table, "_pc_col_idx_cache", None)
+        if cached is not None and cached < ncols and self._is_product_code_header(model, cached):
+            return cached
+
         pc_col_idx = None
         try:
-            headers = []
-            for i in range(table.columnCount()):
-                hi = table.horizontalHeaderItem(i)
-                if hi:
-                    headers.append(hi.text())
-                else:
-                    headers.append("")
-            for i, h in enumerate(headers):
-                if "product" in h.lower() and "code" in h.lower():
+            for i in range(ncols):
+                if self._is_product_code_header(model, i):
                     pc_col_idx = i
                     break
         except Exception:
             pass
+        table._pc_col_idx_cache = pc_col_idx
 
         if pc_col_idx is None:
             # fallback index guess (your screenshot suggests product code is around column 4)
             pc_col_idx = 4
-
-        matched = None
-        for r in range(table.rowCount()):
-            try:
-                item = table.item(r, pc_col_idx)
-                if item and product_code.lower() in item.text().lower():
-                    matched = r
-                    break
-            except Exception:
-                continue
-
-        if matched is not None:
-            table.selectRow(matched)
-            try:
-                table.scrollToItem(table.item(matched, pc_col_idx), hint=QTableWidget.PositionAtCenter)
-            except Exception:
-                pass
+        return pc_col_idx
 
     # =================== helper used by tiles to safely open modules ===================
-    def _safe_open(self, key, friendly, cls_ref):
+    def _safe_open(self, key, friendly, **kwargs):
         """
-        key: error key in _submodule_errors (string)
+        key: submodule name (also its error key in _submodule_errors)
         friendly: friendly dialog title
-        cls_ref: class reference (e.g. TrayDataWindow)
+        kwargs: extra keyword arguments for the window class
         """
+        cls_ref = _load_window_class(key)
         if self._show_import_problem(key):
             return
         if cls_ref is None:
             QMessageBox.warning(self, "Not available", f"{friendly} module/class not available.")
             return
         try:
-            name = key
-            self._tray_windows[name] = cls_ref(self)
-            self._tray_windows[name].show()
+            self._show_tray_window(key, lambda: cls_ref(self, **kwargs))
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open {friendly}:\n{e}")
-            print(traceback.format_exc())
+            self._queue_error("Error", f"Failed to open {friendly}:\n{e}")
+            logger.exception("Failed to open %s", friendly)
+
+    def _show_tray_window(self, key, create):
+        """
+        Show the one window kept per key (a submodule name). A window that is still
+        open is just raised; after the user closed it (or Qt deleted it) a fresh one
+        is built with create(), so it starts from a clean state.
+        """
+        win = self._tray_windows.get(key)
+        if win is None or not shiboken6.isValid(win) or win.isHidden():
+            if win is not None and shiboken6.isValid(win):
+                win.deleteLater()  # closed windows are only hidden; release the old one
+            win = create()
+            self._tray_windows[key] = win
+        win.show()
+        win.raise_()
+        win.activateWindow()
+        return win
+
+    def _queue_error(self, title, message):
+        """Report an error without a modal loop; errors queued in one event-loop pass share a box"""
+        self._error_queue.append((title, message))
+        self._error_timer.start()
+
+    def _flush_errors(self):
+        if not self._error_queue:
+            return
+        # repeat clicks on a failing tile queue the same error again; show it once
+        errors = dict.fromkeys(self._error_queue)
+        self._error_queue.clear()
+        titles = {title for title, _ in errors}
+        title = titles.pop() if len(titles) == 1 else "Errors"
+        text = "\n\n".join(message for _, message in errors)
+        box = QMessageBox(QMessageBox.Critical, title, text, QMessageBox.Ok, self)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.setModal(False)
+        box.show()
 
     # ---------- subwindow openers ----------
     def _show_import_problem(self, key):
         if key in _submodule_errors:
-            detail = _submodule_errors[key]
-            QMessageBox.critical(self, "Module error", f"Failed to load module: {key}\n\nSee console for details.")
-            print(f"--- ERROR: {key} ---\n{detail}")
+            detail = _format_submodule_error(_submodule_errors[key])
+            self._queue_error("Module error", f"Failed to load module: {key}\n\nSee console for details.")
+            logger.error(f"--- ERROR: {key} ---\n{detail}")
             return True
         return False
 
@@ -815,116 +935,51 @@ class MainWindow(QMainWindow):
         keys = "\n".join(_submodule_errors.keys())
         QMessageBox.warning(self, "Submodule load errors", f"The following failed:\n{keys}\n\nCheck console for stack traces.")
         for k, v in _submodule_errors.items():
-            print(f"--- {k} ---\n{v}\n")
-
-    def open_tray_config_window(self):
-        if self._show_import_problem("tray_config_window") or TrayConfigWindow is None:
-            return
-        try:
-            self._tray_windows["tray_config"] = TrayConfigWindow(self)
-            self._tray_windows["tray_config"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open TrayConfigWindow:\n{e}")
-            print(traceback.format_exc())
-
-    def open_call_tray_window(self):
-        if self._show_import_problem("call_tray_details") or CallTrayDetailsWindow is None:
-            return
-        try:
-            self._tray_windows["call_tray"] = CallTrayDetailsWindow(self)
-            self._tray_windows["call_tray"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open CallTrayDetailsWindow:\n{e}")
-            print(traceback.format_exc())
-
-    def open_inventory_list_window(self):
-        if self._show_import_problem("inventory_list") or InventoryListWindow is None:
-            return
-        try:
-            self._tray_windows["inventory"] = InventoryListWindow(self)
-            self._tray_windows["inventory"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open InventoryListWindow:\n{e}")
-            print(traceback.format_exc())
-
-    def open_tray_data_window(self):
-        if self._show_import_problem("tray_data") or TrayDataWindow is None:
-            return
-        try:
-            self._tray_windows["tray_data"] = TrayDataWindow(self)
-            self._tray_windows["tray_data"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open TrayDataWindow:\n{e}")
-            print(traceback.format_exc())
-
-    def open_tray_partition_window(self):
-        if self._show_import_problem("tray_partition") or TrayPartitionWindow is None:
-            return
-        try:
-            self._tray_windows["tray_partition"] = TrayPartitionWindow(self)
-            self._tray_windows["tray_partition"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open TrayPartitionWindow:\n{e}")
-            print(traceback.format_exc())
+            logger.error(f"--- {k} ---\n{_format_submodule_error(v)}")
+
+    # (submodule key, friendly title) for each window opened through _safe_open
+    open_tray_config_window = functools.partialmethod(_safe_open, "tray_config_window", "Tray Configuration")
+    open_call_tray_window = functools.partialmethod(_safe_open, "call_tray_details", "Call Tray Details")
+    open_inventory_list_window = functools.partialmethod(_safe_open, "inventory_list", "Inventory List")
+    open_tray_data_window = functools.partialmethod(_safe_open, "tray_data", "Tray Data")
+    open_tray_partition_window = functools.partialmethod(_safe_open, "tray_partition", "Tray Partition")
+    open_machine_status_window = functools.partialmethod(_safe_open, "machine_status", "Machine Status")
+    open_available_space_window = functools.partialmethod(_safe_open, "available_space", "Available Space")
+    open_material_tracking_window = functools.partialmethod(_safe_open, "material_tracking", "Material Tracking")
 
     def open_settings_window(self):
-        if self._show_import_problem("settings_window") or SettingsWindow is None:
-            return
-        try:
-            def _on_settings_saved(cfg):
-                self.default_rows = cfg.get("default_rows", getattr(self, "default_rows", 4))
-                self.default_cols = cfg.get("default_cols", getattr(self, "default_cols", 8))
-                QMessageBox.information(self, "Settings Applied", f"Settings saved.\nRows: {self.default_rows}  Cols: {self.default_cols}")
+        def _on_settings_saved(cfg):
+            self.default_rows = cfg.get("default_rows", getattr(self, "default_rows", 4))
+            self.default_cols = cfg.get("default_cols", getattr(self, "default_cols", 8))
+            QMessageBox.information(self, "Settings Applied", f"Settings saved.\nRows: {self.default_rows}  Cols: {self.default_cols}")
 
-            self._tray_windows["settings"] = SettingsWindow(self, settings_file="settings.json", on_settings_saved=_on_settings_saved)
-            self._tray_windows["settings"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open SettingsWindow:\n{e}")
-            print(traceback.format_exc())
-
-    def open_machine_status_window(self):
-        if self._show_import_problem("machine_status") or MachineStatusWindow is None:
-            return
-        try:
-            self._tray_windows["machine_status"] = MachineStatusWindow(self)
-            self._tray_windows["machine_status"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open MachineStatusWindow:\n{e}")
-            print(traceback.format_exc())
-
-    def open_available_space_window(self):
-        if self._show_import_problem("available_space") or AvailableSpaceWindow is None:
-            return
-        try:
-            self._tray_windows["available_space"] = AvailableSpaceWindow(self)
-            self._tray_windows["available_space"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open AvailableSpaceWindow:\n{e}")
-            print(traceback.format_exc())
-
-    def open_material_tracking_window(self):
-        if self._show_import_problem("material_tracking") or "MaterialTrackingWindow" not in globals():
-            return
-        try:
-            self._tray_windows["material_tracking"] = MaterialTrackingWindow(self)
-            self._tray_windows["material_tracking"].show()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open MaterialTrackingWindow:\n{e}")
-            print(traceback.format_exc())
+        self._safe_open("settings_window", "Settings",
+                        settings_file="settings.json", on_settings_saved=_on_settings_saved)
 
 
 if __name__ == "__main__":
-    print("Running open_gui_merged2.py")
-    print("Current folder:", os.path.abspath(os.path.dirname(__file__)))
-    print("Python:", sys.version.splitlines()[0])
+    # Console output for this module's logger only: the root logger is left for
+    # game_3's basicConfig (stdout + asrs_debug.log) once it is imported.
+    # Warnings and errors by default; ABB_GUI_DEBUG adds info/debug records,
+    # including the startup banner.
+    _console = logging.StreamHandler(sys.stdout)
+    _console.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s'))
+    logger.addHandler(_console)
+    logger.setLevel(logging.DEBUG if os.environ.get("ABB_GUI_DEBUG") else logging.WARNING)
+    logger.propagate = False  # no second copy through game_3's stdout handler
 
     app = QApplication(sys.argv)
     win = MainWindow()
     win.show()
 
+    # startup banner after the window is up
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Running open_gui_merged2.py")
+        logger.debug(f"Current folder: {os.path.abspath(os.path.dirname(__file__))}")
+        logger.debug(f"Python: {sys.version.splitlines()[0]}")
+
     if _submodule_errors:
-        print("\n--- Submodule import issues detected ---")
-        for k, v in _submodule_errors.items():
-            print(f"- {k}")
+        logger.warning("Submodule import issues detected: " + ", ".join(_submodule_errors))
 
     sys.exit(app.exec())
@@ -0,0 +1,67 @@
+"""
+Numba-compiled A* kernel used by game_3.a_star_pathfinding when available.
+
+Mirrors the pure-Python search in game_3 (same (f, -g, idx) heap ordering
+and neighbour order), so both return identical paths.
+"""
+
+import heapq
+
+import numpy as np
+from numba import njit
+
+# 4-connected neighbour offsets, same order as game_3._OFFS
+_DR = (-1, 1, 0, 0)
+_DC = (0, 0, -1, 1)
+
+
+@njit(cache=True)
+def astar(grid, sr, sc, tr, tc):
+    """Path from (sr, sc) to (tr, tc) avoiding non-zero cells of grid.
+
+    Returns an (n, 2) int64 array of (row, col) steps, start excluded;
+    empty when the goal is unreachable. The goal cell itself may be occupied.
+    """
+    rows, cols = grid.shape
+    size = rows * cols
+    start_idx = sr * cols + sc
+    goal_idx = tr * cols + tc
+    g_score = np.full(size, size, np.int64)
+    came_from = np.full(size, -1, np.int64)
+    g_score[start_idx] = 0
+
+    # (f, -g, idx): deepest node first among equal f, as in game_3
+    open_list = [(np.int64(0), np.int64(0), np.int64(start_idx))]
+    while len(open_list) > 0:
+        current = heapq.heappop(open_list)[2]
+
+        if current == goal_idx:
+            n = g_score[current]
+            path = np.empty((n, 2), np.int64)
+            i = n - 1
+            while current != start_idx:
+                path[i, 0] = current // cols
+                path[i, 1] = current % cols
+                current = came_from[current]
+                i -= 1
+            return path
+
+        row = current // cols
+        col = current % cols
+        tentative_g = g_score[current] + 1
+
+        for k in range(4):
+            n_row = row + _DR[k]
+            n_col = col + _DC[k]
+            if not (0 <= n_row < rows and 0 <= n_col < cols):
+                continue
+            neighbor = n_row * cols + n_col
+            if grid[n_row, n_col] != 0 and neighbor != goal_idx:
+                continue
+            if tentative_g < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                f_score = tentative_g + abs(n_row - tr) + abs(n_col - tc)
+                heapq.heappush(open_list, (f_score, -tentative_g, neighbor))
+
+    return np.empty((0, 2), np.int64)